@@ -122,6 +122,18 @@ if __name__ == "__main__":
                 logger.error(f"GUI mode requires qasync and PyQt5 libraries: {e}")
                 sys.exit(1)
 
+            # Keep compiled QML units in the application cache directory so later
+            # runs load them instead of parsing the QML again. Qt reads this when
+            # the first QML engine is created, so it must be set before that
+            try:
+                from src.utils.resource_finder import get_user_cache_dir
+
+                os.environ.setdefault(
+                    "QML_DISK_CACHE_PATH", str(get_user_cache_dir() / "qmlcache")
+                )
+            except Exception as e:
+                logger.debug(f"Failed to set QML cache directory: {e}")
+
             qt_app = QApplication.instance() or QApplication(sys.argv)
 
             loop = qasync.QEventLoop(qt_app)
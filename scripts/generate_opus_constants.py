@@ -0,0 +1,59 @@
+"""Record the opus library path at build time.
+
+Run from the project root before packaging:
+
+    python scripts/generate_opus_constants.py
+
+It resolves libopus once with the same search order as setup_opus and writes
+src/utils/_opus_constants.py, which setup_opus loads directly at runtime
+instead of probing. Libraries inside the project are stored relative to the
+project root so the path stays valid after the bundle is moved."""
+
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils.opus_loader import (  # noqa: E402
+    find_system_opus,
+    get_search_paths,
+    get_system_info,
+)
+
+OUTPUT_FILE = PROJECT_ROOT / "src" / "utils" / "_opus_constants.py"
+
+
+def resolve_opus_path() -> str:
+    """Find the opus library, preferring the copies shipped with the project."""
+    system, arch_name = get_system_info()
+    for dir_path, file_name in get_search_paths(system, arch_name):
+        full_path = dir_path / file_name
+        if full_path.is_file():
+            return str(full_path.resolve())
+    return find_system_opus()
+
+
+def main() -> int:
+    lib_path = resolve_opus_path()
+    if not lib_path or not os.path.isfile(lib_path):
+        print(f"opus library not found (got {lib_path!r}), nothing written")
+        return 1
+
+    try:
+        opus_path = Path(lib_path).relative_to(PROJECT_ROOT).as_posix()
+    except ValueError:
+        opus_path = lib_path
+
+    OUTPUT_FILE.write_text(
+        "# Generated by scripts/generate_opus_constants.py, do not edit\n"
+        f"OPUS_PATH = {opus_path!r}\n",
+        encoding="utf-8",
+    )
+    print(f"Wrote {OUTPUT_FILE}: OPUS_PATH = {opus_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -22,6 +22,7 @@ from src.plugins.ui import UIPlugin
 from src.plugins.wake_word import WakeWordPlugin
 from src.protocols.mqtt_protocol import MqttProtocol
 from src.protocols.websocket_protocol import WebsocketProtocol
+from src.utils.common_utils import stop_audio_worker
 from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
 from src.utils.opus_loader import setup_opus
@@ -483,6 +484,9 @@ class Application:
             except Exception:
                 pass
 
+            # Drop queued prompt audio so exit does not wait for it
+            stop_audio_worker()
+
             logger.info("Application close completed")
         except Exception as e:
             logger.error(f"Error closing app: {e}", exc_info=True)
@@ -1,5 +1,7 @@
 import asyncio
 import json
+import logging
+import random
 import ssl
 import time
 
@@ -14,6 +16,10 @@ ssl_context = ssl._create_unverified_context()
 
 logger = get_logger(__name__)
 
+# Text frames larger than this are parsed in a worker thread so that bulky JSON
+# payloads do not stall the event loop; small control frames stay inline.
+JSON_OFFLOAD_THRESHOLD = 64 * 1024
+
 
 class WebsocketProtocol(Protocol):
     def __init__(self):
@@ -22,7 +28,6 @@ class WebsocketProtocol(Protocol):
         self.config = ConfigManager.get_instance()
         self.websocket = None
         self.connected = False
-        self.hello_received = None  # Set to None when initializing
         # Message processing task reference for easy cancellation on shutdown
         self._message_task = None
 
@@ -32,6 +37,9 @@ class WebsocketProtocol(Protocol):
         self._ping_interval = 30.0  # Heartbeat interval (seconds)
         self._ping_timeout = 10.0  # ping timeout (seconds)
         self._heartbeat_task = None
+        self._monitor_interval = 5.0  # Connection check interval (seconds)
+        self._monitor_handle = None
+        # Task handling a connection loss detected by the monitor
         self._connection_monitor_task = None
 
         # connection status flag
@@ -63,9 +71,6 @@ class WebsocketProtocol(Protocol):
             return False
 
         try:
-            # Create an Event when connecting, making sure you are in the correct event loop
-            self.hello_received = asyncio.Event()
-
             # Determine if SSL should be used
             current_ssl_context = None
             if self.WEBSOCKET_URL.startswith("wss://"):
@@ -97,15 +102,6 @@ class WebsocketProtocol(Protocol):
                     compression=None,  # Disable compression
                 )
 
-            # Start message processing loop (save task reference, can be canceled when closing)
-            self._message_task = asyncio.create_task(self._message_handler())
-
-            # Comment out the custom heartbeat and use the built-in heartbeat mechanism of websockets
-            # self._start_heartbeat()
-
-            # Start connection monitoring
-            self._start_connection_monitor()
-
             # Send client hello message
             hello_message = {
                 "type": "hello",
@@ -123,18 +119,12 @@ class WebsocketProtocol(Protocol):
             }
             await self.send_text(json.dumps(hello_message))
 
-            # Wait for server hello response
+            # Read the server hello inline before the message loop starts, so no
+            # cross-task wakeup is needed to learn that the handshake finished
             try:
-                await asyncio.wait_for(self.hello_received.wait(), timeout=10.0)
-                self.connected = True
-                self._reconnect_attempts = 0  # Reset reconnection count
-                logger.info("Connected to WebSocket server")
-
-                # Notify connection status changes
-                if self._on_connection_state_changed:
-                    self._on_connection_state_changed(True, "Connection successful")
-
-                return True
+                hello_ok = await asyncio.wait_for(
+                    self._receive_server_hello(), timeout=10.0
+                )
             except asyncio.TimeoutError:
                 logger.error("Timeout waiting for server hello response")
                 await self._cleanup_connection()
@@ -142,6 +132,33 @@ class WebsocketProtocol(Protocol):
                     self._on_network_error("Timeout waiting for response")
                 return False
 
+            if not hello_ok:
+                await self._cleanup_connection()
+                return False
+
+            # Start message processing loop (save task reference, can be canceled when closing)
+            self._message_task = asyncio.create_task(self._message_handler())
+
+            # Comment out the custom heartbeat and use the built-in heartbeat mechanism of websockets
+            # self._start_heartbeat()
+
+            # Start connection monitoring
+            self._start_connection_monitor()
+
+            self.connected = True
+            self._reconnect_attempts = 0  # Reset reconnection count
+            logger.info("Connected to WebSocket server")
+
+            # Notify connection status changes
+            if self._on_connection_state_changed:
+                self._on_connection_state_changed(True, "Connection successful")
+
+            # The channel is usable from here on, so the callback is neither
+            # bounded by the hello timeout nor blocks incoming frames
+            await self._notify_audio_channel_opened()
+
+            return True
+
         except Exception as e:
             logger.error(f"WebSocket connection failed: {e}")
             await self._cleanup_connection()
@@ -149,19 +166,41 @@ class WebsocketProtocol(Protocol):
                 self._on_network_error(f"Unable to connect to service: {str(e)}")
             return False
 
+    async def _receive_server_hello(self) -> bool:
+        """Receive frames until the server hello arrives.
+
+        Frames that arrive before the hello are dispatched to the regular callbacks.
+
+        Returns:
+            bool: whether the server hello was accepted"""
+        while True:
+            message = await self.websocket.recv()
+            if isinstance(message, bytes):
+                if self._on_incoming_audio:
+                    self._on_incoming_audio(message)
+                continue
+
+            try:
+                data = json.loads(message)
+            except json.JSONDecodeError as e:
+                logger.error(f"Invalid JSON message: {message}, error: {e}")
+                continue
+
+            if data.get("type") == "hello":
+                return await self._handle_server_hello(data)
+            if self._on_incoming_json:
+                self._on_incoming_json(data)
+
     def _start_heartbeat(self):
         """Start the heartbeat detection task."""
         if self._heartbeat_task is None or self._heartbeat_task.done():
             self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
 
     def _start_connection_monitor(self):
-        """Start the connection monitoring task."""
-        if (
-            self._connection_monitor_task is None
-            or self._connection_monitor_task.done()
-        ):
-            self._connection_monitor_task = asyncio.create_task(
-                self._connection_monitor()
+        """Start the connection monitoring timer."""
+        if self._monitor_handle is None:
+            self._monitor_handle = asyncio.get_running_loop().call_later(
+                self._monitor_interval, self._monitor_tick
             )
 
     async def _heartbeat_loop(self):
@@ -198,26 +237,28 @@ class WebsocketProtocol(Protocol):
         except Exception as e:
             logger.error(f"Abnormal heartbeat circulation: {e}")
 
-    async def _connection_monitor(self):
-        """Connection health status monitoring."""
-        try:
-            while self.websocket and not self._is_closing:
-                await asyncio.sleep(5)  # Check every 5 seconds
+    def _monitor_tick(self):
+        """Connection health status monitoring, rescheduled on the event loop timer."""
+        self._monitor_handle = None
+        if not self.websocket or self._is_closing:
+            return
 
-                # Check connection status
-                if self.websocket:
-                    if self.websocket.close_code is not None:
-                        logger.warning("Detected WebSocket connection closed")
-                        await self._handle_connection_loss("connection closed")
-                        break
+        # Check connection status
+        if self.websocket.close_code is not None:
+            logger.warning("Detected WebSocket connection closed")
+            self._connection_monitor_task = asyncio.create_task(
+                self._handle_connection_loss("connection closed")
+            )
+            return
 
-        except asyncio.CancelledError:
-            logger.debug("The connection monitoring task was canceled")
-        except Exception as e:
-            logger.error(f"Connection monitoring exception: {e}")
+        self._start_connection_monitor()
 
     async def _handle_connection_loss(self, reason: str):
         """Handle connection loss."""
+        # An orderly close is already tearing the connection down
+        if self._is_closing:
+            return
+
         logger.warning(f"Connection lost: {reason}")
 
         # Update connection status
@@ -276,8 +317,10 @@ class WebsocketProtocol(Protocol):
             f"Attempt automatic reconnection ({self._reconnect_attempts}/{self._max_reconnect_attempts})"
         )
 
-        # Wait for a while and then reconnect.
-        await asyncio.sleep(min(self._reconnect_attempts * 2, 30))  # Exponential backoff, maximum 30 seconds
+        # Exponential backoff (maximum 30 seconds) with jitter, so that clients
+        # dropped at the same time do not reconnect in lockstep.
+        delay = min(2**self._reconnect_attempts, 30)
+        await asyncio.sleep(delay * (0.5 + random.random()))
 
         try:
             success = await self.connect()
@@ -309,6 +352,9 @@ class WebsocketProtocol(Protocol):
             enabled: Whether to enable automatic reconnection
             max_attempts: Maximum number of reconnection attempts"""
         self._auto_reconnect_enabled = enabled
+        # Once the maximum number of attempts is exhausted, reconnection stays
+        # off until it is explicitly re-enabled here.
+        self._reconnect_attempts = 0
         if enabled:
             self._max_reconnect_attempts = max_attempts
             logger.info(f"Enable automatic reconnection, maximum number of attempts: {max_attempts}")
@@ -345,11 +391,15 @@ class WebsocketProtocol(Protocol):
                 try:
                     if isinstance(message, str):
                         try:
-                            data = json.loads(message)
+                            if len(message) > JSON_OFFLOAD_THRESHOLD:
+                                data = await asyncio.to_thread(json.loads, message)
+                            else:
+                                data = json.loads(message)
                             msg_type = data.get("type")
                             if msg_type == "hello":
                                 # Handling server hello messages
-                                await self._handle_server_hello(data)
+                                if await self._handle_server_hello(data):
+                                    await self._notify_audio_channel_opened()
                             else:
                                 if self._on_incoming_json:
                                     self._on_incoming_json(data)
@@ -393,18 +443,7 @@ class WebsocketProtocol(Protocol):
         if not self.is_audio_channel_opened():
             return
 
-        try:
-            await self.websocket.send(data)
-        except websockets.ConnectionClosed as e:
-            logger.warning(f"Connection closed while sending audio: {e}")
-            await self._handle_connection_loss(f"Failed to send audio: {e.code} {e.reason}")
-        except websockets.ConnectionClosedError as e:
-            logger.warning(f"Connection error while sending audio: {e}")
-            await self._handle_connection_loss(f"Sending audio error: {e.code} {e.reason}")
-        except Exception as e:
-            logger.error(f"Failed to send audio data: {e}")
-            # Don't call the network error callback here, let the connection handler handle it
-            await self._handle_connection_loss(f"Send audio exception: {str(e)}")
+        await self._send_raw(data, "audio")
 
     async def send_text(self, message: str):
         """Send a text message."""
@@ -412,17 +451,26 @@ class WebsocketProtocol(Protocol):
             logger.warning("WebSocket is not connected or is closing, unable to send message")
             return
 
+        await self._send_raw(message, "text")
+
+    async def _send_raw(self, data, kind: str):
+        """Send a frame, routing any failure to the connection loss handler.
+
+        Args:
+            data: text or binary frame to send
+            kind: payload description used in log messages"""
         try:
-            await self.websocket.send(message)
+            await self.websocket.send(data)
         except websockets.ConnectionClosed as e:
-            logger.warning(f"Connection closed while sending text: {e}")
-            await self._handle_connection_loss(f"Failed to send text: {e.code} {e.reason}")
-        except websockets.ConnectionClosedError as e:
-            logger.warning(f"Connection error while sending text: {e}")
-            await self._handle_connection_loss(f"Error sending text: {e.code} {e.reason}")
+            # Also covers ConnectionClosedError, which is a subclass
+            logger.warning(f"Connection closed while sending {kind}: {e}")
+            await self._handle_connection_loss(
+                f"Failed to send {kind}: {e.code} {e.reason}"
+            )
         except Exception as e:
-            logger.error(f"Failed to send text message: {e}")
-            await self._handle_connection_loss(f"Exception when sending text: {str(e)}")
+            logger.error(f"Failed to send {kind}: {e}")
+            # Don't call the network error callback here, let the connection handler handle it
+            await self._handle_connection_loss(f"Exception when sending {kind}: {str(e)}")
 
     def is_audio_channel_opened(self) -> bool:
         """Check if the audio channel is open.
@@ -447,59 +495,73 @@ class WebsocketProtocol(Protocol):
             return await self.connect()
         return True
 
-    async def _handle_server_hello(self, data: dict):
-        """Handle the server's hello message."""
+    async def _handle_server_hello(self, data: dict) -> bool:
+        """Handle the server's hello message.
+
+        Returns:
+            bool: whether the hello was accepted"""
         try:
             # Verify transfer method
             transport = data.get("transport")
             if not transport or transport != "websocket":
                 logger.error(f"Unsupported transport: {transport}")
-                return
-
-            # Set hello to receive events
-            self.hello_received.set()
-
-            # Notification audio channel is open
-            if self._on_audio_channel_opened:
-                await self._on_audio_channel_opened()
+                if self._on_network_error:
+                    self._on_network_error(f"Unsupported transport: {transport}")
+                return False
 
             logger.info("Server hello message successfully processed")
+            return True
 
         except Exception as e:
             logger.error(f"Error processing server hello message: {e}")
             if self._on_network_error:
                 self._on_network_error(f"Failed to process server response: {str(e)}")
+            return False
+
+    async def _notify_audio_channel_opened(self):
+        """Notify the application that the audio channel is open."""
+        if not self._on_audio_channel_opened:
+            return
+        try:
+            await self._on_audio_channel_opened()
+        except Exception as e:
+            logger.error(f"Audio channel opened callback failed: {e}")
 
     async def _cleanup_connection(self):
         """Clean up connection related resources."""
         self.connected = False
 
-        # Cancel the message processing task to prevent the event loop from still waiting after exiting.
-        if self._message_task and not self._message_task.done():
-            self._message_task.cancel()
-            try:
-                await self._message_task
-            except asyncio.CancelledError:
-                pass
-            except Exception as e:
-                logger.debug(f"Exception when waiting for message task cancellation: {e}")
+        # Stop the connection monitoring timer
+        if self._monitor_handle is not None:
+            self._monitor_handle.cancel()
+            self._monitor_handle = None
+
+        # Cancel the message processing, heartbeat and connection monitoring tasks
+        # together so teardown costs one scheduler round instead of three.
+        # The calling task (e.g. the message handler reporting a connection loss)
+        # is left alone so it can finish the loss handling itself.
+        current = asyncio.current_task()
+        pending = [
+            task
+            for task in (
+                self._message_task,
+                self._heartbeat_task,
+                self._connection_monitor_task,
+            )
+            if task and task is not current and not task.done()
+        ]
         self._message_task = None
 
-        # Cancel heartbeat task
-        if self._heartbeat_task and not self._heartbeat_task.done():
-            self._heartbeat_task.cancel()
-            try:
-                await self._heartbeat_task
-            except asyncio.CancelledError:
-                pass
-
-        # Cancel the connection monitoring task
-        if self._connection_monitor_task and not self._connection_monitor_task.done():
-            self._connection_monitor_task.cancel()
-            try:
-                await self._connection_monitor_task
-            except asyncio.CancelledError:
-                pass
+        if pending:
+            for task in pending:
+                task.cancel()
+            results = await asyncio.gather(*pending, return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(
+                            f"Exception when waiting for task cancellation: {result}"
+                        )
 
         # Close WebSocket connection
         if self.websocket and self.websocket.close_code is None:
@@ -1,109 +1,225 @@
 """The general tool function collection module includes text-to-speech, browser operation, clipboard and other general tool functions."""
 
-import queue
+import asyncio
+import os
+import platform
+import re
 import shutil
+import subprocess
 import threading
 import time
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
-# Global audio playback queue and lock
-_audio_queue = queue.Queue()
-_audio_lock = threading.Lock()
-_audio_worker_thread = None
-_audio_worker_running = False
+_IS_WINDOWS = os.name == "nt"
+_SYSTEM = platform.system()
+
+if _IS_WINDOWS:
+    try:
+        import win32com.client
+    except ImportError:
+        win32com = None
+else:
+    win32com = None
+
+# Single-worker executor for audio playback, its one thread plays queued text in
+# submission order so playback is serialized without any extra locking
+_audio_executor: Optional[ThreadPoolExecutor] = None
+# Guards executor creation only, never held while audio plays
+_audio_worker_lock = threading.Lock()
 _audio_device_warmed_up = False
+_audio_worker_exit_registered = False
+_warm_up_process = None
+
+# Windows SAPI voice cache. COM objects belong to the thread that created them,
+# so the cache is per thread (in practice only the audio worker thread).
+_sapi_cache = threading.local()
+
+# Activate related keyword list
+_ACTIVATION_KEYWORDS = (
+    "Log in",
+    "control Panel",
+    "activation",
+    "Verification code",
+    "Bind device",
+    "Add device",
+    "enter confirmation code",
+    "enter",
+    "panel",
+    "xiaozhi.me",
+    "activation code",
+)
+# All keywords in a single alternation so the text is scanned once
+_ACTIVATION_KEYWORD_PATTERN = re.compile(
+    "|".join(re.escape(keyword) for keyword in _ACTIVATION_KEYWORDS), re.IGNORECASE
+)
+
+# More precise verification code matching pattern
+# Matches a 6-digit verification code, possibly separated by spaces
+_CODE_PATTERNS = tuple(
+    re.compile(pattern)
+    for pattern in (
+        r"Verification code[::]\s*(\d{6})",  # Verification code: 123456
+        r"Enter verification code [::]\s*(\d{6})",  # Enter verification code: 123456
+        r"Enter \s*(\d{6})",  # Enter 123456
+        r"Verification code\s*(\d{6})",  # Verification code 123456
+        r"Activation code[::]\s*(\d{6})",  # Activation code: 123456
+        r"(\d{6})[，,。.]",  # 123456, or 123456.
+        r"[，,。.]\s*(\d{6})",  # ，123456
+    )
+)
+_FALLBACK_CODE_PATTERN = re.compile(r"((?:\d\s*){6,})")
+# Every pattern above needs at least six (possibly spaced) digits
+_CODE_PREFILTER = re.compile(r"(?:\d\s*){6}")
 
 
 def _warm_up_audio_device():
-    """Preheat audio equipment to prevent first words from being swallowed."""
-    global _audio_device_warmed_up
+    """Preheat audio equipment to prevent first words from being swallowed.
+
+    The warm-up is spawned in the background and does not block the caller; the
+    audio worker waits for it in _finish_audio_warm_up before the first playback."""
+    global _audio_device_warmed_up, _warm_up_process
     if _audio_device_warmed_up:
         return
+    _audio_device_warmed_up = True
 
     try:
-        import platform
-        import subprocess
-
-        system = platform.system()
-
-        if system == "Darwin":
-            subprocess.run(
+        if _SYSTEM == "Darwin":
+            _warm_up_process = subprocess.Popen(
                 ["say", "-v", "Ting-Ting", "buzz"],
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
             )
-        elif system == "Linux" and shutil.which("espeak"):
-            subprocess.run(
+        elif _SYSTEM == "Linux" and shutil.which("espeak"):
+            _warm_up_process = subprocess.Popen(
                 ["espeak", "-v", "zh", "buzz"],
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
             )
-        elif system == "Windows":
-            import win32com.client
+        logger.info("Audio device warm-up started")
+    except Exception as e:
+        logger.warning(f"Failed to warm up audio device: {e}")
 
-            speaker = win32com.client.Dispatch("SAPI.SpVoice")
-            speaker.Speak("buzz")
 
-        _audio_device_warmed_up = True
+def _finish_audio_warm_up():
+    """Complete the audio device warm-up on the playback thread."""
+    global _warm_up_process
+    process = _warm_up_process
+    _warm_up_process = None
+
+    try:
+        if process is not None:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                # Do not leave a hung player behind
+                process.kill()
+                process.wait()
+                raise
+        elif _IS_WINDOWS:
+            # SAPI objects are bound to the playback thread, so warm up here
+            speaker, _, _ = _get_sapi_speaker()
+            speaker.Speak("buzz")
         logger.info("Audio device warmed up")
     except Exception as e:
         logger.warning(f"Failed to warm up audio device: {e}")
 
 
-def _audio_queue_worker():
-    """Audio queue worker thread that ensures audio plays in order and is not truncated."""
+def _play_with_fallback(text: str) -> None:
+    """Play text on the audio worker thread, ensuring it is not truncated."""
+    try:
+        logger.info(f"Start playing audio: {text[:50]}...")
+        success = _play_system_tts(text)
+
+        if not success:
+            logger.warning("System TTS failed, try alternative solution")
+            if _IS_WINDOWS:
+                _play_windows_tts(text, set_chinese_voice=False)
+            else:
+                _play_system_tts(text)
+
+        time.sleep(0.5)  # Pause after playback to prevent the tail sound from being swallowed
+    except Exception as e:
+        logger.error(f"Audio playback error: {e}")
 
-    while _audio_worker_running:
-        try:
-            text = _audio_queue.get(timeout=1)
-            if text is None:
-                break
 
-            with _audio_lock:
-                logger.info(f"Start playing audio: {text[:50]}...")
-                success = _play_system_tts(text)
+def stop_audio_worker():
+    """Stop the audio worker, discarding audio that has not started playing."""
+    global _audio_executor
 
-                if not success:
-                    logger.warning("System TTS failed, try alternative solution")
-                    import os
+    with _audio_worker_lock:
+        if _audio_executor is not None:
+            _audio_executor.shutdown(wait=False, cancel_futures=True)
+            _audio_executor = None
 
-                    if os.name == "nt":
-                        _play_windows_tts(text, set_chinese_voice=False)
-                    else:
-                        _play_system_tts(text)
 
-                time.sleep(0.5)  # Pause after playback to prevent the tail sound from being swallowed
+def _register_audio_worker_exit():
+    """Stop the audio worker at interpreter exit, before its thread is joined.
 
-            _audio_queue.task_done()
+    concurrent.futures joins its workers from a threading exit hook, which runs
+    before atexit handlers; hooks run in reverse order, so this one registered
+    later runs first and queued audio is discarded instead of played."""
+    global _audio_worker_exit_registered
+    if _audio_worker_exit_registered:
+        return
+    try:
+        threading._register_atexit(stop_audio_worker)
+        _audio_worker_exit_registered = True
+    except (AttributeError, RuntimeError) as e:
+        logger.debug(f"Failed to register audio worker exit hook: {e}")
 
-        except queue.Empty:
-            continue
-        except Exception as e:
-            logger.error(f"Audio queue worker thread error: {e}")
 
-    logger.info("Audio queue worker thread stopped")
+def _ensure_audio_worker() -> ThreadPoolExecutor:
+    """Make sure the audio worker is running.
 
+    Returns:
+        ThreadPoolExecutor: the single-worker audio playback executor"""
+    global _audio_executor
 
-def _ensure_audio_worker():
-    """Make sure the audio worker thread is running."""
-    global _audio_worker_thread, _audio_worker_running
+    executor = _audio_executor
+    if executor is not None:
+        return executor
+
+    # Concurrent first callers must not start two workers
+    with _audio_worker_lock:
+        if _audio_executor is None:
+            _warm_up_audio_device()
+            executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="audio-tts"
+            )
+            executor.submit(_finish_audio_warm_up)
+            _audio_executor = executor
+            _register_audio_worker_exit()
+            logger.info("Audio worker started")
+        return _audio_executor
+
+
+_browser = None
 
-    if _audio_worker_thread is None or not _audio_worker_thread.is_alive():
-        _warm_up_audio_device()
-        _audio_worker_running = True
-        _audio_worker_thread = threading.Thread(target=_audio_queue_worker, daemon=True)
-        _audio_worker_thread.start()
-        logger.info("Audio queue worker thread started")
+
+def _get_browser():
+    """Get the default browser controller, probing the environment only once."""
+    global _browser
+    if _browser is None:
+        _browser = webbrowser.get()
+    return _browser
 
 
 def open_url(url: str) -> bool:
     try:
-        success = webbrowser.open(url)
+        try:
+            browser = _get_browser()
+        except webbrowser.Error:
+            browser = None
+        success = browser.open(url) if browser else False
+        if not success:
+            # Let webbrowser try the other registered browsers
+            success = webbrowser.open(url)
         if success:
             logger.info(f"Web page successfully opened: {url}")
         else:
@@ -129,31 +245,52 @@ def copy_to_clipboard(text: str) -> bool:
         return False
 
 
-def _play_windows_tts(text: str, set_chinese_voice: bool = True) -> bool:
+def _get_sapi_speaker():
+    """Get the cached SAPI speaker with its default and Chinese voices.
+
+    Returns:
+        tuple: (speaker, default_voice, chinese_voice), chinese_voice may be None"""
+    cached = getattr(_sapi_cache, "speaker", None)
+    if cached is not None:
+        return cached
+
+    if win32com is None:
+        raise ImportError("win32com is not available")
+
+    speaker = win32com.client.Dispatch("SAPI.SpVoice")
+    default_voice = speaker.Voice
+
+    chinese_voice = None
     try:
-        import win32com.client
+        voices = speaker.GetVoices()
+        for i in range(voices.Count):
+            if "Chinese" in voices.Item(i).GetDescription():
+                chinese_voice = voices.Item(i)
+                break
+    except Exception as e:
+        logger.warning(f"Error setting Chinese tone: {e}")
 
-        speaker = win32com.client.Dispatch("SAPI.SpVoice")
+    try:
+        speaker.Rate = -2
+    except Exception:
+        pass
 
-        if set_chinese_voice:
-            try:
-                voices = speaker.GetVoices()
-                for i in range(voices.Count):
-                    if "Chinese" in voices.Item(i).GetDescription():
-                        speaker.Voice = voices.Item(i)
-                        break
-            except Exception as e:
-                logger.warning(f"Error setting Chinese tone: {e}")
+    _sapi_cache.speaker = (speaker, default_voice, chinese_voice)
+    return _sapi_cache.speaker
 
-        try:
-            speaker.Rate = -2
-        except Exception:
-            pass
+
+def _play_windows_tts(text: str, set_chinese_voice: bool = True) -> bool:
+    try:
+        speaker, default_voice, chinese_voice = _get_sapi_speaker()
+
+        if set_chinese_voice and chinese_voice is not None:
+            speaker.Voice = chinese_voice
+        else:
+            speaker.Voice = default_voice
 
         enhanced_text = text + "。 。 。"
         speaker.Speak(enhanced_text)
         logger.info("Text played using Windows speech synthesis")
-        time.sleep(0.5)
         return True
     except ImportError:
         logger.warning("Windows TTS not available, skipping audio playback")
@@ -164,8 +301,6 @@ def _play_windows_tts(text: str, set_chinese_voice: bool = True) -> bool:
 
 
 def _play_linux_tts(text: str) -> bool:
-    import subprocess
-
     if shutil.which("espeak"):
         try:
             enhanced_text = text + "。 。 。"
@@ -175,7 +310,6 @@ def _play_linux_tts(text: str) -> bool:
                 stderr=subprocess.DEVNULL,
                 timeout=30,
             )
-            time.sleep(0.5)
             return result.returncode == 0
         except subprocess.TimeoutExpired:
             logger.warning("espeak playback timeout")
@@ -189,8 +323,6 @@ def _play_linux_tts(text: str) -> bool:
 
 
 def _play_macos_tts(text: str) -> bool:
-    import subprocess
-
     if shutil.which("say"):
         try:
             enhanced_text = text + "。 。 。"
@@ -200,7 +332,6 @@ def _play_macos_tts(text: str) -> bool:
                 stderr=subprocess.DEVNULL,
                 timeout=30,
             )
-            time.sleep(0.5)
             return result.returncode == 0
         except subprocess.TimeoutExpired:
             logger.warning("say command playback timeout")
@@ -214,80 +345,54 @@ def _play_macos_tts(text: str) -> bool:
 
 
 def _play_system_tts(text: str) -> bool:
-    import os
-    import platform
-
-    if os.name == "nt":
+    if _IS_WINDOWS:
         return _play_windows_tts(text)
+    elif _SYSTEM == "Linux":
+        return _play_linux_tts(text)
+    elif _SYSTEM == "Darwin":
+        return _play_macos_tts(text)
     else:
-        system = platform.system()
-        if system == "Linux":
-            return _play_linux_tts(text)
-        elif system == "Darwin":
-            return _play_macos_tts(text)
-        else:
-            logger.warning(f"Unsupported system {system}, skip audio playback")
-            return False
+        logger.warning(f"Unsupported system {_SYSTEM}, skip audio playback")
+        return False
 
 
 def play_audio_nonblocking(text: str) -> None:
     try:
-        _ensure_audio_worker()
-        _audio_queue.put(text)
+        _ensure_audio_worker().submit(_play_with_fallback, text)
         logger.info(f"Audio task added to queue: {text[:50]}...")
     except Exception as e:
         logger.error(f"Error adding audio task to queue: {e}")
 
-        def audio_worker():
-            try:
-                _warm_up_audio_device()
-                _play_system_tts(text)
-            except Exception as e:
-                logger.error(f"Error playing backup audio: {e}")
 
-        threading.Thread(target=audio_worker, daemon=True).start()
+async def play_audio_nonblocking_async(text: str) -> None:
+    """Play text from async code on the audio worker, keeping playback order.
+
+    Cancelling the awaiting task drops the text if it has not started playing."""
+    try:
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(_ensure_audio_worker(), _play_with_fallback, text)
+        logger.info(f"Audio task added to queue: {text[:50]}...")
+    except Exception as e:
+        logger.error(f"Error adding audio task to queue: {e}")
+        return
+    await future
 
 
 def extract_verification_code(text: str) -> Optional[str]:
     try:
-        import re
-
-        # Activate related keyword list
-        activation_keywords = [
-            "Log in",
-            "control Panel",
-            "activation",
-            "Verification code",
-            "Bind device",
-            "Add device",
-            "enter confirmation code",
-            "enter",
-            "panel",
-            "xiaozhi.me",
-            "activation code",
-        ]
+        # Cheap single-pass rejection of text that cannot contain a code
+        if len(text) < 6 or not _CODE_PREFILTER.search(text):
+            return None
 
         # Check if the text contains activation related keywords
-        has_activation_keyword = any(keyword in text for keyword in activation_keywords)
+        has_activation_keyword = _ACTIVATION_KEYWORD_PATTERN.search(text) is not None
 
         if not has_activation_keyword:
             logger.debug(f"The text does not contain activation keywords, skip verification code extraction: {text}")
             return None
 
-        # More precise verification code matching pattern
-        # Matches a 6-digit verification code, possibly separated by spaces
-        patterns = [
-            r"Verification code[::]\s*(\d{6})",  # Verification code: 123456
-            r"Enter verification code [::]\s*(\d{6})",  # Enter verification code: 123456
-            r"Enter \s*(\d{6})",  # Enter 123456
-            r"Verification code\s*(\d{6})",  # Verification code 123456
-            r"Activation code[::]\s*(\d{6})",  # Activation code: 123456
-            r"(\d{6})[，,。.]",  # 123456, or 123456.
-            r"[，,。.]\s*(\d{6})",  # ，123456
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text)
+        for pattern in _CODE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 code = match.group(1)
                 logger.info(f"Verification code extracted from text: {code}")
@@ -295,7 +400,7 @@ def extract_verification_code(text: str) -> Optional[str]:
 
         # If there is an activation keyword but no exact pattern is matched, try the original pattern
         # but requires specific context around the number
-        match = re.search(r"((?:\d\s*){6,})", text)
+        match = _FALLBACK_CODE_PATTERN.search(text)
         if match:
             code = "".join(match.group(1).split())
             # The verification code should be 6 digits
@@ -1,10 +1,14 @@
 import asyncio
 import json
-from typing import Optional
+import logging
+from typing import Optional, Set, Tuple
 
 import aiohttp
 
-from src.utils.common_utils import handle_verification_code
+from src.utils.common_utils import (
+    handle_verification_code,
+    play_audio_nonblocking_async,
+)
 from src.utils.device_fingerprint import DeviceFingerprint
 from src.utils.logging_config import get_logger
 
@@ -26,6 +30,15 @@ class DeviceActivator:
         # Currently active tasks
         self._activation_task: Optional[asyncio.Task] = None
 
+        # HTTP session shared by all activation requests (created lazily)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        # Last verification code prompt as (code, text), reused across retries
+        self._code_prompt: Optional[Tuple[str, str]] = None
+
+        # Pending verification code playback tasks
+        self._audio_tasks: Set[asyncio.Task] = set()
+
     def _ensure_device_identity(self):
         """Make sure the device identity has been created."""
         (
@@ -43,6 +56,45 @@ class DeviceActivator:
             self.logger.info("Deactivating task")
             self._activation_task.cancel()
 
+        # Drop prompts that have not started playing yet
+        for task in self._audio_tasks:
+            task.cancel()
+
+    def _play_code_prompt(self, text: str):
+        """Queue the verification code prompt for playback on the audio worker."""
+        task = asyncio.create_task(play_audio_nonblocking_async(text))
+        self._audio_tasks.add(task)
+        task.add_done_callback(self._audio_tasks.discard)
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, keeping connections alive between requests."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=4, ttl_dns_cache=300, keepalive_timeout=60
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=aiohttp.ClientTimeout(total=10)
+            )
+        return self._session
+
+    async def aclose(self):
+        """Close the shared HTTP session."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _get_code_prompt(self, code: str) -> str:
+        """Get the verification code prompt text, built once per code."""
+        if self._code_prompt is None or self._code_prompt[0] != code:
+            text = f".Please log in to the control panel to add a device and enter the verification code: {' '.join(code)}..."
+            self._code_prompt = (code, text)
+        return self._code_prompt[1]
+
+    @staticmethod
+    def _error_retry_delay(consecutive_errors: int) -> float:
+        """Delay before retrying after consecutive errors, capped at 30 seconds."""
+        return min(30.0, 2 + consecutive_errors * 0.5)
+
     def has_serial_number(self) -> bool:
         """Check if there is a serial number."""
         return self.device_fingerprint.has_serial_number()
@@ -114,7 +166,7 @@ class DeviceActivator:
             self.logger.info(f"Verification code: {code}")
 
             # Construct the verification code prompt text and print it
-            text = f".Please log in to the control panel to add a device and enter the verification code: {' '.join(code)}..."
+            text = self._get_code_prompt(code)
             print("\n==================")
             print(text)
             print("==================\n")
@@ -122,10 +174,8 @@ class DeviceActivator:
 
             # Use voice to play verification code
             try:
-                # Play speech in a non-blocking thread
-                from src.utils.common_utils import play_audio_nonblocking
-
-                play_audio_nonblocking(text)
+                # Play speech on the audio worker without blocking activation
+                self._play_code_prompt(text)
                 self.logger.info("Verification code voice prompt is playing")
             except Exception as e:
                 self.logger.error(f"Failed to play verification code voice: {e}")
@@ -147,6 +197,9 @@ class DeviceActivator:
         Returns:
             bool: whether activation was successful"""
         try:
+            # Record the current task so that cancel_activation interrupts any wait
+            self._activation_task = asyncio.current_task()
+
             # Check serial number
             serial_number = self.get_serial_number()
             if not serial_number:
@@ -193,130 +246,143 @@ class DeviceActivator:
             }
 
             # Print debugging information
-            self.logger.debug(f"Request headers: {headers}")
-            payload_str = json.dumps(payload, indent=2, ensure_ascii=False)
-            self.logger.debug(f"Request payload: {payload_str}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"Request headers: {headers}")
+                payload_str = json.dumps(payload, indent=2, ensure_ascii=False)
+                self.logger.debug(f"Request payload: {payload_str}")
 
             # Retry logic
-            max_retries = 60  # Maximum wait time is 5 minutes
-            retry_interval = 5  # Set retry interval of 5 seconds
+            max_retries = 60  # Maximum number of attempts
+            max_wait = 300  # Maximum wait time is 5 minutes, whatever the delays
+            retry_interval = 5  # Polling interval while waiting for the verification code
+
+            # Errors back off progressively instead of polling at a fixed rate
+            consecutive_errors = 0
 
             error_count = 0
             last_error = None
 
-            # Create an aiohttp session and set a reasonable timeout
-            timeout = aiohttp.ClientTimeout(total=10)
-
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                for attempt in range(max_retries):
-                    try:
-                        self.logger.info(
-                            f"Attempt to activate (try {attempt + 1}/{max_retries})..."
-                        )
-
-                        # Play verification code every time you retry (starting from the 2nd time)
-                        if attempt > 0 and code:
-                            try:
-                                from src.utils.common_utils import (
-                                    play_audio_nonblocking,
-                                )
-
-                                text = f".Please log in to the control panel to add a device and enter the verification code: {' '.join(code)}..."
-                                play_audio_nonblocking(text)
-                                self.logger.info(f"Retry playing verification code: {code}")
-                            except Exception as e:
-                                self.logger.error(f"Failed to retry playing verification code: {e}")
-
-                        # Send activation request
-                        async with session.post(
-                            activate_url, headers=headers, json=payload
-                        ) as response:
-                            # Read response
-                            response_text = await response.text()
-
-                            # Print full response
-                            self.logger.warning(f"\nActivation response (HTTP {response.status}):")
-                            try:
-                                response_json = json.loads(response_text)
+            # The retry prompt does not change between attempts
+            retry_text = self._get_code_prompt(code) if code else None
+
+            session = await self._get_session()
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + max_wait
+            attempts_made = 0
+            for attempt in range(max_retries):
+                if attempt > 0 and loop.time() >= deadline:
+                    break
+                attempts_made += 1
+                try:
+                    self.logger.info(
+                        f"Attempt to activate (try {attempt + 1}/{max_retries})..."
+                    )
+
+                    # Play verification code every time you retry (starting from the 2nd time)
+                    if attempt > 0 and retry_text:
+                        try:
+                            self._play_code_prompt(retry_text)
+                            self.logger.info(f"Retry playing verification code: {code}")
+                        except Exception as e:
+                            self.logger.error(f"Failed to retry playing verification code: {e}")
+
+                    # Send activation request
+                    async with session.post(
+                        activate_url, headers=headers, json=payload
+                    ) as response:
+                        # Read response, decoding the body as JSON only once
+                        try:
+                            response_json = await response.json(content_type=None)
+                        except (aiohttp.ContentTypeError, json.JSONDecodeError):
+                            response_json = None
+
+                        # Print full response
+                        if self.logger.isEnabledFor(logging.WARNING):
+                            self.logger.warning(
+                                f"\nActivation response (HTTP {response.status}):"
+                            )
+                            if response_json is not None:
                                 self.logger.warning(json.dumps(response_json, indent=2))
-                            except json.JSONDecodeError:
-                                self.logger.warning(response_text)
+                            else:
+                                self.logger.warning(await response.text())
+
+                        # Check response status code
+                        if response.status == 200:
+                            # Activation successful
+                            self.logger.info("Device activation successful!")
+                            self.set_activation_status(True)
+                            return True
 
-                            # Check response status code
-                            if response.status == 200:
-                                # Activation successful
-                                self.logger.info("Device activation successful!")
-                                self.set_activation_status(True)
-                                return True
+                        elif response.status == 202:
+                            # Wait for user to enter verification code
+                            self.logger.info("Waiting for the user to enter the verification code, continue waiting...")
 
-                            elif response.status == 202:
-                                # Wait for user to enter verification code
-                                self.logger.info("Waiting for the user to enter the verification code, continue waiting...")
+                            consecutive_errors = 0
 
-                                # Use cancelable wait
-                                await asyncio.sleep(retry_interval)
+                            # Use cancelable wait
+                            await asyncio.sleep(retry_interval)
 
+                        else:
+                            # Handle other errors but keep retrying
+                            if isinstance(response_json, dict):
+                                error_msg = response_json.get(
+                                    "error", f"Unknown error (status code: {response.status})"
+                                )
                             else:
-                                # Handle other errors but keep retrying
-                                error_msg = "unknown error"
-                                try:
-                                    error_data = json.loads(response_text)
-                                    error_msg = error_data.get(
-                                        "error", f"Unknown error (status code: {response.status})"
-                                    )
-                                except json.JSONDecodeError:
-                                    error_msg = (
-                                        f"The server returned an error (status code: {response.status})"
-                                    )
+                                error_msg = (
+                                    f"The server returned an error (status code: {response.status})"
+                                )
+
+                            # Log errors but do not terminate the process
+                            if error_msg != last_error:
+                                self.logger.warning(
+                                    f"The server returns: {error_msg}, continue to wait for the verification code to be activated."
+                                )
+                                last_error = error_msg
 
-                                # Log errors but do not terminate the process
-                                if error_msg != last_error:
+                            # Count consecutive identical errors
+                            if "Device not found" in error_msg:
+                                error_count += 1
+                                if error_count >= 5 and error_count % 5 == 0:
                                     self.logger.warning(
-                                        f"The server returns: {error_msg}, continue to wait for the verification code to be activated."
+                                        "\nTip: If the error persists, you may need to refresh the page on the website to obtain a new verification code\n"
                                     )
-                                    last_error = error_msg
-
-                                # Count consecutive identical errors
-                                if "Device not found" in error_msg:
-                                    error_count += 1
-                                    if error_count >= 5 and error_count % 5 == 0:
-                                        self.logger.warning(
-                                            "\nTip: If the error persists, you may need to refresh the page on the website to obtain a new verification code\n"
-                                        )
-
-                                # Use cancelable wait
-                                await asyncio.sleep(retry_interval)
-
-                    except asyncio.CancelledError:
-                        # Respond to a cancellation signal
-                        self.logger.info("Activation process canceled")
-                        return False
-
-                    except aiohttp.ClientError as e:
-                        self.logger.warning(f"Network request failed: {e}, retrying...")
-                        await asyncio.sleep(retry_interval)
-
-                    except asyncio.TimeoutError as e:
-                        self.logger.warning(f"Request timeout: {e}, retrying...")
-                        await asyncio.sleep(retry_interval)
-
-                    except Exception as e:
-                        # Get exception details
-                        import traceback
-
-                        error_detail = (
-                            str(e) if str(e) else f"{type(e).__name__}: Unknown error"
-                        )
-                        self.logger.warning(
-                            f"An error occurred during activation: {error_detail}, retrying..."
-                        )
-                        # Print complete exception information in debug mode
-                        self.logger.debug(f"Complete exception information: {traceback.format_exc()}")
-                        await asyncio.sleep(retry_interval)
-
-            # Maximum number of retries reached
+
+                            # Use cancelable wait
+                            consecutive_errors += 1
+                            await asyncio.sleep(self._error_retry_delay(consecutive_errors))
+
+                except asyncio.CancelledError:
+                    # Respond to a cancellation signal
+                    self.logger.info("Activation process canceled")
+                    return False
+
+                except aiohttp.ClientError as e:
+                    self.logger.warning(f"Network request failed: {e}, retrying...")
+                    consecutive_errors += 1
+                    await asyncio.sleep(self._error_retry_delay(consecutive_errors))
+
+                except asyncio.TimeoutError as e:
+                    self.logger.warning(f"Request timeout: {e}, retrying...")
+                    consecutive_errors += 1
+                    await asyncio.sleep(self._error_retry_delay(consecutive_errors))
+
+                except Exception as e:
+                    # Get exception details
+                    error_detail = (
+                        str(e) if str(e) else f"{type(e).__name__}: Unknown error"
+                    )
+                    self.logger.warning(
+                        f"An error occurred during activation: {error_detail}, retrying..."
+                    )
+                    # Print complete exception information in debug mode
+                    self.logger.debug("Complete exception information", exc_info=True)
+                    consecutive_errors += 1
+                    await asyncio.sleep(self._error_retry_delay(consecutive_errors))
+
+            # Maximum number of retries or wait time reached
             self.logger.error(
-                f"Activation failed, maximum retries ({max_retries}) reached, last error: {last_error}"
+                f"Activation failed after {attempts_made} attempts (limit {max_retries} attempts / {max_wait}s), last error: {last_error}"
             )
             return False
 
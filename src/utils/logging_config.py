@@ -1,11 +1,42 @@
 import logging
+from functools import partial
 from logging.handlers import TimedRotatingFileHandler
 
 from colorlog import ColoredFormatter
 
 
+# Formatters are built once and shared by every handler
+_FILE_FORMATTER = logging.Formatter(
+    "%(asctime)s[%(name)s] - %(levelname)s - %(message)s - %(threadName)s"
+)
+
+# Console color formatter
+_COLOR_FORMATTER = ColoredFormatter(
+    "%(green)s%(asctime)s%(reset)s[%(blue)s%(name)s%(reset)s] - "
+    "%(log_color)s%(levelname)s%(reset)s - %(green)s%(message)s%(reset)s - "
+    "%(cyan)s%(threadName)s%(reset)s",
+    log_colors={
+        "DEBUG": "cyan",
+        "INFO": "white",
+        "WARNING": "yellow",
+        "ERROR": "red",
+        "CRITICAL": "red,bg_white",
+    },
+    secondary_log_colors={"asctime": {"green": "green"}, "name": {"blue": "blue"}},
+)
+
+# Log file of the configured logging system, None until setup_logging runs
+_log_file = None
+
+
 def setup_logging():
-    """Configure the logging system."""
+    """Configure the logging system.
+
+    Repeated calls keep the existing handlers and return the same log file."""
+    global _log_file
+    if _log_file is not None:
+        return _log_file
+
     from .resource_finder import get_project_root
 
     # Use resource_finder to get the project root directory and create the logs directory
@@ -39,27 +70,8 @@ def setup_logging():
     file_handler.setLevel(logging.INFO)
     file_handler.suffix = "%Y-%m-%d.log"  # Log file suffix format
 
-    # Create formatter
-    formatter = logging.Formatter(
-        "%(asctime)s[%(name)s] - %(levelname)s - %(message)s - %(threadName)s"
-    )
-
-    # Console color formatter
-    color_formatter = ColoredFormatter(
-        "%(green)s%(asctime)s%(reset)s[%(blue)s%(name)s%(reset)s] - "
-        "%(log_color)s%(levelname)s%(reset)s - %(green)s%(message)s%(reset)s - "
-        "%(cyan)s%(threadName)s%(reset)s",
-        log_colors={
-            "DEBUG": "cyan",
-            "INFO": "white",
-            "WARNING": "yellow",
-            "ERROR": "red",
-            "CRITICAL": "red,bg_white",
-        },
-        secondary_log_colors={"asctime": {"green": "green"}, "name": {"blue": "blue"}},
-    )
-    console_handler.setFormatter(color_formatter)
-    file_handler.setFormatter(formatter)
+    console_handler.setFormatter(_COLOR_FORMATTER)
+    file_handler.setFormatter(_FILE_FORMATTER)
 
     # Add handler to root logger
     root_logger.addHandler(console_handler)
@@ -68,9 +80,21 @@ def setup_logging():
     # Output log configuration information
     logging.info("The log system has been initialized, log file: %s", log_file)
 
+    _log_file = log_file
     return log_file
 
 
+def log_error_with_exc(logger, msg, *args, **kwargs):
+    """Log errors and automatically include exception stacks.
+
+    Args:
+        logger: Logger used to emit the record
+        msg: Log message, followed by its formatting arguments
+    """
+    kwargs["exc_info"] = True
+    logger.error(msg, *args, **kwargs)
+
+
 def get_logger(name):
     """Get the unified configured logger.
 
@@ -87,13 +111,8 @@ def get_logger(name):
     """
     logger = logging.getLogger(name)
 
-    # Add some helper methods
-    def log_error_with_exc(msg, *args, **kwargs):
-        """Log errors and automatically include exception stacks."""
-        kwargs["exc_info"] = True
-        logger.error(msg, *args, **kwargs)
-
-    # Add to logger
-    logger.error_exc = log_error_with_exc
+    # Add helper methods once, getLogger returns the same instance for a name
+    if not hasattr(logger, "error_exc"):
+        logger.error_exc = partial(log_error_with_exc, logger)
 
     return logger
@@ -1,18 +1,31 @@
 # Process opus dynamic library before importing opuslib
 import ctypes
+import logging
 import os
 import platform
-import shutil
 import sys
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Tuple, Union, cast
+from typing import Dict, Iterator, Optional, Tuple, Union, cast
 
 # Get logger
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Result of the first setup_opus call, returned directly on re-entry
+_SETUP_RESULT: Optional[bool] = None
+
+# Library paths served by the patched ctypes.util.find_library
+_PATCHED_LIBRARIES: Dict[str, str] = {}
+
+# System libraries opened directly by soname, mapped to their resolved paths
+_SYSTEM_LIBRARY_CACHE: Dict[str, str] = {}
+
+# Handle of the loaded opus library, kept so it is never garbage collected
+_opus_handle: Optional[ctypes.CDLL] = None
+
 
 # Platform constant definition
 class PLATFORM(Enum):
@@ -37,63 +50,73 @@ class LIB_PATH(Enum):
 
 # Dynamic link library name constant definition
 class LIB_INFO(Enum):
-    WINDOWS = {"name": "opus.dll", "system_name": ["opus"]}
-    MACOS = {"name": "libopus.dylib", "system_name": ["libopus.dylib"]}
-    LINUX = {"name": "libopus.so", "system_name": ["libopus.so.0", "libopus.so"]}
+    WINDOWS = {"name": "opus.dll", "system_name": ("opus",)}
+    MACOS = {"name": "libopus.dylib", "system_name": ("libopus.dylib",)}
+    LINUX = {"name": "libopus.so", "system_name": ("libopus.so.0", "libopus.so")}
+
+
+# platform.system() names (lowercased) mapped to platforms, anything else is Linux
+_PLATFORM_FROM_STR = {
+    "windows": PLATFORM.WINDOWS,
+    "darwin": PLATFORM.MACOS,
+}
+
+# Directory names of each platform under libs/libopus
+_SYSTEM_DIRS = {
+    PLATFORM.WINDOWS: "win",
+    PLATFORM.MACOS: "mac",
+    PLATFORM.LINUX: "linux",
+}
+
+# Per-platform library table flattened from the constants above, so each lookup
+# is a single dict index instead of an if/elif chain over the enums
+_LIB_TABLE = {
+    system: {
+        "dir": _SYSTEM_DIRS[system],
+        "arch": ARCH[system.name].value,
+        "path_template": LIB_PATH[system.name].value,
+        "name": LIB_INFO[system.name].value["name"],
+        "system_names": LIB_INFO[system.name].value["system_name"],
+    }
+    for system in PLATFORM
+}
 
+# Machine architecture, normalized once per process
+_PLATFORM_MACHINE = platform.machine().lower()
+_IS_ARM = "arm" in _PLATFORM_MACHINE or "aarch64" in _PLATFORM_MACHINE
 
+
+# Hardware and OS do not change at runtime, so probe once per process
+@lru_cache(maxsize=None)
 def get_platform() -> str:
-    system = platform.system().lower()
-    if system == "windows" or system.startswith("win"):
-        system = PLATFORM.WINDOWS
-    elif system == "darwin":
-        system = PLATFORM.MACOS
-    else:
-        system = PLATFORM.LINUX
-    return system
+    return _PLATFORM_FROM_STR.get(platform.system().lower(), PLATFORM.LINUX)
 
 
+@lru_cache(maxsize=None)
 def get_arch(system: PLATFORM) -> str:
-    architecture = platform.machine().lower()
-    is_arm = "arm" in architecture or "aarch64" in architecture
-    if system == PLATFORM.WINDOWS:
-        arch_name = ARCH.WINDOWS.value["arm" if is_arm else "intel"]
-    elif system == PLATFORM.MACOS:
-        arch_name = ARCH.MACOS.value["arm" if is_arm else "intel"]
-    else:
-        arch_name = ARCH.LINUX.value["arm" if is_arm else "intel"]
-    return architecture, arch_name
+    arch_name = _LIB_TABLE[system]["arch"]["arm" if _IS_ARM else "intel"]
+    return _PLATFORM_MACHINE, arch_name
 
 
+@lru_cache(maxsize=None)
 def get_lib_path(system: PLATFORM, arch_name: str):
-    if system == PLATFORM.WINDOWS:
-        lib_name = LIB_PATH.WINDOWS.value
-    elif system == PLATFORM.MACOS:
-        lib_name = LIB_PATH.MACOS.value.format(arch=arch_name)
-    else:
-        lib_name = LIB_PATH.LINUX.value.format(arch=arch_name)
-    return lib_name
+    return _LIB_TABLE[system]["path_template"].format(arch=arch_name)
 
 
-def get_lib_name(system: PLATFORM, local: bool = True) -> Union[str, List[str]]:
+@lru_cache(maxsize=None)
+def get_lib_name(system: PLATFORM, local: bool = True) -> Union[str, Tuple[str, ...]]:
     """Get the library name.
 
     Args:
         system (PLATFORM): platform
-        local (bool, optional): Whether to get the local name (str), the default is True. If it is False, get the system name list (List).
+        local (bool, optional): Whether to get the local name (str), the default is True. If it is False, get the system name tuple (Tuple).
 
     Returns:
-        str | List: library name"""
-    key = "name" if local else "system_name"
-    if system == PLATFORM.WINDOWS:
-        lib_name = LIB_INFO.WINDOWS.value[key]
-    elif system == PLATFORM.MACOS:
-        lib_name = LIB_INFO.MACOS.value[key]
-    else:
-        lib_name = LIB_INFO.LINUX.value[key]
-    return lib_name
+        str | Tuple: library name"""
+    return _LIB_TABLE[system]["name" if local else "system_names"]
 
 
+@lru_cache(maxsize=None)
 def get_system_info() -> Tuple[str, str]:
     """Get current system information."""
     # Standardized system name
@@ -106,52 +129,92 @@ def get_system_info() -> Tuple[str, str]:
     return system, arch_name
 
 
-def get_search_paths(system: PLATFORM, arch_name: str) -> List[Tuple[Path, str]]:
-    """Get a list of library file search paths (using Unified Resource Finder)"""
-    from .resource_finder import find_libs_dir, get_project_root
+@lru_cache(maxsize=16)
+def _cached_find_libs_dir(
+    subdir: Optional[str] = None, arch: Optional[str] = None
+) -> Optional[Path]:
+    """Find a libs directory, walking the filesystem once per (subdir, arch)"""
+    from .resource_finder import find_libs_dir
 
-    lib_name = cast(str, get_lib_name(system))
+    return find_libs_dir(*(part for part in (subdir, arch) if part))
 
-    search_paths: List[Tuple[Path, str]] = []
 
-    # Mapping system names to directory names
-    system_dir_map = {
-        PLATFORM.WINDOWS: "win",
-        PLATFORM.MACOS: "mac",
-        PLATFORM.LINUX: "linux",
-    }
+def get_search_paths(system: PLATFORM, arch_name: str) -> Iterator[Tuple[Path, str]]:
+    """Yield library file search paths in priority order (using Unified Resource Finder)
+
+    Paths are produced lazily, so later candidates are not resolved once the caller
+    has found the library."""
+    from .resource_finder import get_project_root
+
+    lib_name = cast(str, get_lib_name(system))
+    system_dir = _LIB_TABLE[system]["dir"]
+    project_root = get_project_root()
 
-    system_dir = system_dir_map.get(system)
+    # The bundled layout under the project root is checked first: each candidate
+    # costs the caller a single stat and no resource finder directory walk
+    libs_dir = project_root / "libs"
+    yield libs_dir / "libopus" / system_dir / arch_name, lib_name
+    yield libs_dir / "libopus" / system_dir, lib_name
+    yield libs_dir, lib_name
 
-    # First try to find the libs directory for your specific platform and architecture
-    if system_dir:
-        specific_libs_dir = find_libs_dir(f"libopus/{system_dir}", arch_name)
-        if specific_libs_dir:
-            search_paths.append((specific_libs_dir, lib_name))
-            logger.debug(f"Find the specific platform architecture libs directory: {specific_libs_dir}")
+    # Otherwise try to find the libs directory for your specific platform and architecture
+    specific_libs_dir = _cached_find_libs_dir(f"libopus/{system_dir}", arch_name)
+    if specific_libs_dir:
+        logger.debug(f"Find the specific platform architecture libs directory: {specific_libs_dir}")
+        yield specific_libs_dir, lib_name
 
     # Then look for the libs directory for the specific platform
-    if system_dir:
-        platform_libs_dir = find_libs_dir(f"libopus/{system_dir}")
-        if platform_libs_dir:
-            search_paths.append((platform_libs_dir, lib_name))
-            logger.debug(f"Find the platform-specific libs directory: {platform_libs_dir}")
+    platform_libs_dir = _cached_find_libs_dir(f"libopus/{system_dir}")
+    if platform_libs_dir:
+        logger.debug(f"Find the platform-specific libs directory: {platform_libs_dir}")
+        yield platform_libs_dir, lib_name
 
     # Find common libs directory
-    general_libs_dir = find_libs_dir()
+    general_libs_dir = _cached_find_libs_dir()
     if general_libs_dir:
-        search_paths.append((general_libs_dir, lib_name))
         logger.debug(f"Add general libs directory: {general_libs_dir}")
+        yield general_libs_dir, lib_name
 
     # Add the project root directory as a last resort
-    project_root = get_project_root()
-    search_paths.append((project_root, lib_name))
+    yield project_root, lib_name
+
 
-    # Print all search paths to help debugging
-    for dir_path, filename in search_paths:
-        full_path = dir_path / filename
-        logger.debug(f"Search path: {full_path} (Exists: {full_path.exists()})")
-    return search_paths
+def _loaded_library_path(lib_name: str) -> str:
+    """Resolve the file a dlopen'ed soname maps to, using /proc/self/maps (Linux)."""
+    try:
+        with open("/proc/self/maps") as maps:
+            for line in maps:
+                fields = line.split(maxsplit=5)
+                if len(fields) < 6:
+                    continue
+                path = fields[5].rstrip()
+                base_name = os.path.basename(path)
+                if base_name == lib_name or base_name.startswith(lib_name + "."):
+                    return path
+    except OSError:
+        pass
+    return ""
+
+
+def _dlopen_system_library(lib_name: str) -> str:
+    """Open a system library by soname without shelling out to ldconfig.
+
+    Returns:
+        str: the resolved library path (or the soname if it cannot be resolved),
+        empty if the library could not be opened"""
+    cached = _SYSTEM_LIBRARY_CACHE.get(lib_name)
+    if cached:
+        return cached
+
+    try:
+        ctypes.CDLL(lib_name)
+    except OSError as e:
+        logger.debug(f"Failed to load system library {lib_name}: {e}")
+        return ""
+
+    lib_path = _loaded_library_path(lib_name) or lib_name
+    _SYSTEM_LIBRARY_CACHE[lib_name] = lib_path
+    return lib_path
 
 
 def find_system_opus() -> str:
@@ -161,29 +224,55 @@ def find_system_opus() -> str:
 
     try:
         # Get the name of the opus library on the system
-        lib_names = cast(List[str], get_lib_name(system, False))
-
-        # Try loading every possible name
-        for lib_name in lib_names:
-            try:
-                # Import ctypes.util to use find_library function
-                import ctypes.util
-
-                system_lib_path = ctypes.util.find_library(lib_name)
+        lib_names = cast(Tuple[str, ...], get_lib_name(system, False))
+
+        # On POSIX, dlopen the well-known sonames directly, find_library would
+        # spawn ldconfig (Linux) to answer the same question
+        if system != PLATFORM.WINDOWS:
+            for lib_name in lib_names:
+                lib_path = _dlopen_system_library(lib_name)
+                if lib_path:
+                    logger.info(f"Directly load the system opus library: {lib_path}")
+                    return lib_path
+
+        # Fall back to ctypes.util.find_library. Each lookup may spawn a
+        # subprocess (ldconfig, gcc, ...), so every possible name is probed
+        # concurrently and the first one found wins
+        import ctypes.util
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        executor = ThreadPoolExecutor(
+            max_workers=len(lib_names), thread_name_prefix="opus-probe"
+        )
+        try:
+            futures = {
+                executor.submit(ctypes.util.find_library, lib_name): lib_name
+                for lib_name in lib_names
+            }
+            for future in as_completed(futures):
+                try:
+                    system_lib_path = future.result()
+                except Exception as e:
+                    logger.debug(f"Failed to find system library {futures[future]}: {e}")
+                    continue
 
                 if system_lib_path:
-                    lib_path = system_lib_path
-                    logger.info(f"Find the opus library in the system path: {lib_path}")
-                    break
-                else:
-                    # Directly try to load the library name
-                    ctypes.cdll.LoadLibrary(lib_name)
+                    logger.info(f"Find the opus library in the system path: {system_lib_path}")
+                    return system_lib_path
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        # Directly try to load the library names (POSIX already did this above)
+        if system == PLATFORM.WINDOWS:
+            for lib_name in lib_names:
+                try:
+                    ctypes.CDLL(lib_name)
                     lib_path = lib_name
                     logger.info(f"Directly load the system opus library: {lib_name}")
                     break
-            except Exception as e:
-                logger.debug(f"Failed to load system library {lib_name}: {e}")
-                continue
+                except Exception as e:
+                    logger.debug(f"Failed to load system library {lib_name}: {e}")
+                    continue
 
     except Exception as e:
         logger.error(f"Failed to find system opus library: {e}")
@@ -193,6 +282,8 @@ def find_system_opus() -> str:
 
 def copy_opus_to_project(system_lib_path):
     """Copy the system libraries to the project directory."""
+    import shutil
+
     from .resource_finder import get_project_root
 
     system, arch_name = get_system_info()
@@ -216,8 +307,10 @@ def copy_opus_to_project(system_lib_path):
         lib_name = cast(str, get_lib_name(system))
         target_file = target_dir / lib_name
 
-        # Copy files
-        shutil.copy2(system_lib_path, target_file)
+        # Copy contents (sendfile / CopyFile fast path) and permission bits,
+        # the library does not need the rest of the file metadata
+        shutil.copyfile(system_lib_path, target_file)
+        shutil.copymode(system_lib_path, target_file)
         logger.info(f"Copied opus library from {system_lib_path} to {target_file}")
 
         return str(target_file)
@@ -228,12 +321,28 @@ def copy_opus_to_project(system_lib_path):
 
 
 def setup_opus() -> bool:
-    """Set up opus dynamic library."""
+    """Set up opus dynamic library.
+
+    The outcome is cached, repeated calls return it without probing again."""
+    global _SETUP_RESULT
+    if _SETUP_RESULT is None:
+        _SETUP_RESULT = _load_opus()
+    return _SETUP_RESULT
+
+
+def _load_opus() -> bool:
+    """Locate and load the opus dynamic library."""
+    global _opus_handle
+
     # Check if it has been loaded by runtime_hook
     if hasattr(sys, "_opus_loaded"):
         logger.info("opus library has been loaded by runtime hook")
         return True
 
+    # Use the library path recorded at build time when there is one
+    if _load_frozen_opus():
+        return True
+
     # Get current system information
     system, arch_name = get_system_info()
     logger.info(f"Current system: {system}, architecture: {arch_name}")
@@ -245,11 +354,19 @@ def setup_opus() -> bool:
     lib_path = ""
     lib_dir = ""
 
+    # The same stat decides the hit and feeds the log, so logging adds no probes
+    log_candidates = logger.isEnabledFor(logging.DEBUG)
+
     for dir_path, file_name in search_paths:
-        full_path = dir_path / file_name
-        if full_path.exists():
-            lib_path = str(full_path)
-            lib_dir = str(dir_path)
+        # Join as plain strings, a Path would be built only to be stringified
+        dir_str = os.fspath(dir_path)
+        candidate = dir_str + os.sep + file_name
+        exists = os.path.isfile(candidate)
+        if log_candidates:
+            logger.debug(f"Search path: {candidate} (Exists: {exists})")
+        if exists:
+            lib_path = candidate
+            lib_dir = dir_str
             logger.info(f"Find the opus library file: {lib_path}")
             break
 
@@ -261,12 +378,27 @@ def setup_opus() -> bool:
         if system_lib_path:
             # First attempt to use system libraries directly
             try:
-                _ = ctypes.cdll.LoadLibrary(system_lib_path)
+                _opus_handle = ctypes.CDLL(system_lib_path)
                 logger.info(f"The opus library has been loaded from the system path: {system_lib_path}")
                 sys._opus_loaded = True
                 return True
             except Exception as e:
-                logger.warning(f"Failed to load system opus library: {e}, try to copy to project directory")
+                logger.warning(f"Failed to load system opus library: {e}")
+
+            # A Windows DLL often fails only because its dependencies sit next to
+            # it, so make its own directory searchable and retry before copying
+            system_lib_dir = os.path.dirname(system_lib_path)
+            if system == PLATFORM.WINDOWS and system_lib_dir:
+                _add_windows_dll_directory(system_lib_dir)
+                try:
+                    _opus_handle = ctypes.CDLL(system_lib_path)
+                    logger.info(f"The opus library has been loaded from the system path: {system_lib_path}")
+                    sys._opus_loaded = True
+                    return True
+                except Exception as e:
+                    logger.warning(f"Failed to load system opus library: {e}")
+
+            logger.warning("Try to copy the system opus library to the project directory")
 
             # If direct loading fails, try copying to the project directory
             lib_path = copy_opus_to_project(system_lib_path)
@@ -281,16 +413,7 @@ def setup_opus() -> bool:
 
     # Special handling for Windows platform
     if system == PLATFORM.WINDOWS and lib_dir:
-        # Add DLL search path
-        if hasattr(os, "add_dll_directory"):
-            try:
-                os.add_dll_directory(lib_dir)
-                logger.debug(f"Added DLL search path: {lib_dir}")
-            except Exception as e:
-                logger.warning(f"Failed to add DLL search path: {e}")
-
-        # Set environment variables
-        os.environ["PATH"] = lib_dir + os.pathsep + os.environ.get("PATH", "")
+        _add_windows_dll_directory(lib_dir)
 
     # patch library path
     _patch_find_library("opus", lib_path)
@@ -298,7 +421,7 @@ def setup_opus() -> bool:
     # Try loading the library
     try:
         # Load DLL and store reference to prevent garbage collection
-        _ = ctypes.CDLL(lib_path)
+        _opus_handle = ctypes.CDLL(lib_path)
         logger.info(f"Successfully loaded opus library: {lib_path}")
         sys._opus_loaded = True
         return True
@@ -307,15 +430,74 @@ def setup_opus() -> bool:
         return False
 
 
+def _load_frozen_opus() -> bool:
+    """Load the opus library from the path generated at build time.
+
+    Returns False when there is no generated constants module (e.g. in a
+    development checkout) or its path is gone, so the caller probes as usual."""
+    global _opus_handle
+
+    try:
+        from ._opus_constants import OPUS_PATH
+    except ImportError:
+        return False
+
+    # Bundled libraries are recorded relative to the project root
+    if os.path.isabs(OPUS_PATH):
+        lib_path = OPUS_PATH
+    else:
+        from .resource_finder import get_project_root
+
+        lib_path = str(get_project_root() / OPUS_PATH)
+
+    if not os.path.isfile(lib_path):
+        logger.warning(f"Build-time opus library path does not exist: {lib_path}")
+        return False
+
+    if get_platform() == PLATFORM.WINDOWS:
+        _add_windows_dll_directory(os.path.dirname(lib_path))
+
+    _patch_find_library("opus", lib_path)
+
+    try:
+        _opus_handle = ctypes.CDLL(lib_path)
+        logger.info(f"Successfully loaded build-time opus library: {lib_path}")
+        sys._opus_loaded = True
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to load build-time opus library: {e}")
+        return False
+
+
+def _add_windows_dll_directory(lib_dir: str):
+    """Make lib_dir searchable for the opus DLL and its dependencies."""
+    # Add DLL search path
+    if hasattr(os, "add_dll_directory"):
+        try:
+            os.add_dll_directory(lib_dir)
+            logger.debug(f"Added DLL search path: {lib_dir}")
+        except Exception as e:
+            logger.warning(f"Failed to add DLL search path: {e}")
+
+    # Set environment variables
+    os.environ["PATH"] = lib_dir + os.pathsep + os.environ.get("PATH", "")
+
+
 def _patch_find_library(lib_name: str, lib_path: str):
-    """Fix ctypes.util.find_library function."""
+    """Fix ctypes.util.find_library function.
+
+    The function is wrapped only once; later calls just register more libraries."""
     import ctypes.util
 
-    original_find_library = ctypes.util.find_library
+    if not _PATCHED_LIBRARIES:
+        original_find_library = ctypes.util.find_library
+
+        def patched_find_library(name):
+            patched_path = _PATCHED_LIBRARIES.get(name)
+            if patched_path is not None:
+                return patched_path
+            return original_find_library(name)
 
-    def patched_find_library(name):
-        if name == lib_name:
-            return lib_path
-        return original_find_library(name)
+        ctypes.util.find_library = patched_find_library
 
-    ctypes.util.find_library = patched_find_library
+    _PATCHED_LIBRARIES[lib_name] = lib_path
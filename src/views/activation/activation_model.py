@@ -7,6 +7,12 @@ from PyQt5.QtCore import QObject, pyqtProperty, pyqtSignal
 class ActivationModel(QObject):
     """Data model for active windows, used for data binding between Python and QML."""
 
+    # Activation status texts and their colors
+    STATUS_ACTIVATED = ("Activated", "#28a745")
+    STATUS_NOT_ACTIVATED = ("Not activated", "#dc3545")
+    STATUS_NEEDS_REACTIVATION = ("Inconsistent status (requires reactivation)", "#ff9900")
+    STATUS_FIXED = ("Inconsistent status (fixed)", "#28a745")
+
     # attribute change signal
     serialNumberChanged = pyqtSignal()
     macAddressChanged = pyqtSignal()
@@ -29,6 +35,25 @@ class ActivationModel(QObject):
         self._activation_code = "--"
         self._status_color = "#6c757d"
 
+    def _set(self, attr, value, signal):
+        """Store a property value and notify QML only when it changes."""
+        if getattr(self, attr) != value:
+            setattr(self, attr, value)
+            signal.emit()
+
+    def _set_many(self, *updates):
+        """Apply several (attr, value, signal) updates, then notify QML.
+
+        Signals are emitted only after every value is stored, so bindings that
+        read several properties are re-evaluated against the final state."""
+        changed = []
+        for attr, value, signal in updates:
+            if getattr(self, attr) != value:
+                setattr(self, attr, value)
+                changed.append(signal)
+        for signal in changed:
+            signal.emit()
+
     # Serial number attribute
     @pyqtProperty(str, notify=serialNumberChanged)
     def serialNumber(self):
@@ -36,9 +61,7 @@ class ActivationModel(QObject):
 
     @serialNumber.setter
     def serialNumber(self, value):
-        if self._serial_number != value:
-            self._serial_number = value
-            self.serialNumberChanged.emit()
+        self._set("_serial_number", value, self.serialNumberChanged)
 
     # MAC address properties
     @pyqtProperty(str, notify=macAddressChanged)
@@ -47,9 +70,7 @@ class ActivationModel(QObject):
 
     @macAddress.setter
     def macAddress(self, value):
-        if self._mac_address != value:
-            self._mac_address = value
-            self.macAddressChanged.emit()
+        self._set("_mac_address", value, self.macAddressChanged)
 
     # activation state attribute
     @pyqtProperty(str, notify=activationStatusChanged)
@@ -58,9 +79,7 @@ class ActivationModel(QObject):
 
     @activationStatus.setter
     def activationStatus(self, value):
-        if self._activation_status != value:
-            self._activation_status = value
-            self.activationStatusChanged.emit()
+        self._set("_activation_status", value, self.activationStatusChanged)
 
     # Activation code properties
     @pyqtProperty(str, notify=activationCodeChanged)
@@ -69,9 +88,7 @@ class ActivationModel(QObject):
 
     @activationCode.setter
     def activationCode(self, value):
-        if self._activation_code != value:
-            self._activation_code = value
-            self.activationCodeChanged.emit()
+        self._set("_activation_code", value, self.activationCodeChanged)
 
     # Status color attribute
     @pyqtProperty(str, notify=statusColorChanged)
@@ -80,9 +97,7 @@ class ActivationModel(QObject):
 
     @statusColor.setter
     def statusColor(self, value):
-        if self._status_color != value:
-            self._status_color = value
-            self.statusColorChanged.emit()
+        self._set("_status_color", value, self.statusColorChanged)
 
     # Convenience method
     def update_device_info(self, serial_number=None, mac_address=None):
@@ -94,8 +109,31 @@ class ActivationModel(QObject):
 
     def update_activation_status(self, status, color="#6c757d"):
         """Update activation status."""
-        self.activationStatus = status
-        self.statusColor = color
+        self._set_many(
+            ("_activation_status", status, self.activationStatusChanged),
+            ("_status_color", color, self.statusColorChanged),
+        )
+
+    def update_all(self, serial_number, mac_address, status, color, reset_code=True):
+        """Update device information and activation status in one batch."""
+        updates = [
+            ("_serial_number", serial_number, self.serialNumberChanged),
+            ("_mac_address", mac_address, self.macAddressChanged),
+            ("_activation_status", status, self.activationStatusChanged),
+            ("_status_color", color, self.statusColorChanged),
+        ]
+        if reset_code:
+            updates.append(("_activation_code", "--", self.activationCodeChanged))
+        self._set_many(*updates)
+
+    @classmethod
+    def get_status(cls, local_activated, server_activated, status_consistent=True):
+        """Get the (status, color) pair describing an activation state."""
+        if not status_consistent:
+            if local_activated and not server_activated:
+                return cls.STATUS_NEEDS_REACTIVATION
+            return cls.STATUS_FIXED
+        return cls.STATUS_ACTIVATED if local_activated else cls.STATUS_NOT_ACTIVATED
 
     def update_activation_code(self, code):
         """Update activation code."""
@@ -107,16 +145,19 @@ class ActivationModel(QObject):
 
     def set_status_activated(self):
         """Set to activated state."""
-        self.update_activation_status("Activated", "#28a745")
-        self.reset_activation_code()
+        status, color = self.STATUS_ACTIVATED
+        self._set_many(
+            ("_activation_status", status, self.activationStatusChanged),
+            ("_status_color", color, self.statusColorChanged),
+            ("_activation_code", "--", self.activationCodeChanged),
+        )
 
     def set_status_not_activated(self):
         """Set to inactive state."""
-        self.update_activation_status("Not activated", "#dc3545")
+        self.update_activation_status(*self.STATUS_NOT_ACTIVATED)
 
     def set_status_inconsistent(self, local_activated=False, server_activated=False):
         """The setting status is inconsistent."""
-        if local_activated and not server_activated:
-            self.update_activation_status("Inconsistent status (requires reactivation)", "#ff9900")
-        else:
-            self.update_activation_status("Inconsistent status (fixed)", "#28a745")
+        self.update_activation_status(
+            *self.get_status(local_activated, server_activated, False)
+        )
@@ -1,24 +1,75 @@
 # -*- coding: utf-8 -*-
 """The device activation window displays the activation process, device information and activation progress."""
 
+import asyncio
+import os
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from PyQt5.QtCore import QSize, Qt, QUrl, pyqtSignal
+from PyQt5.QtCore import QSize, Qt, QTimer, QUrl, pyqtSignal
 from PyQt5.QtGui import QPainterPath, QRegion
+from PyQt5.QtQml import QQmlEngine, qmlRegisterSingletonType
 from PyQt5.QtQuickWidgets import QQuickWidget
 from PyQt5.QtWidgets import QApplication, QVBoxLayout, QWidget
 
-from src.core.system_initializer import SystemInitializer
-from src.utils.device_activator import DeviceActivator
 from src.utils.logging_config import get_logger
 
 from ..base.async_mixins import AsyncMixin, AsyncSignalEmitter
 from ..base.base_window import BaseWindow
 from .activation_model import ActivationModel
 
+if TYPE_CHECKING:
+    # Imported where used, they pull in most of the application
+    from src.core.system_initializer import SystemInitializer
+    from src.utils.device_activator import DeviceActivator
+
 logger = get_logger(__name__)
 
+# Display server type, detected once for Wayland compatibility
+_IS_WAYLAND = bool(
+    os.environ.get("WAYLAND_DISPLAY")
+    or os.environ.get("XDG_SESSION_TYPE") == "wayland"
+)
+
+# Activation view shell, resolved once for every window opened in the process
+_QML_URL = QUrl.fromLocalFile(str(Path(__file__).parent / "activation_window.qml"))
+
+# Style sheets for small screens, adjusting font sizes
+_COMPACT_STYLE_SHEET = """
+    QLabel { font-size: 10px; }
+    QPushButton { font-size: 10px; padding: 4px 8px; }
+    QTextEdit { font-size: 8px; }
+"""
+_SMALL_SCREEN_STYLE_SHEET = """
+    QLabel { font-size: 11px; }
+    QPushButton { font-size: 11px; padding: 6px 10px; }
+    QTextEdit { font-size: 9px; }
+"""
+
+# The model is exposed to QML as a singleton ("import App.Activation 1.0"), so
+# bindings resolve it at compile time instead of through context lookups
+_model_singleton_registered = False
+
+
+def _activation_model_provider(engine, script_engine):
+    """Provide the model of the window that owns the QML engine."""
+    return engine.property("activationModel")
+
+
+def _register_activation_model():
+    """Register the ActivationModel singleton type once per process."""
+    global _model_singleton_registered
+    if not _model_singleton_registered:
+        qmlRegisterSingletonType(
+            ActivationModel,
+            "App.Activation",
+            1,
+            0,
+            "ActivationModel",
+            _activation_model_provider,
+        )
+        _model_singleton_registered = True
+
 
 class ActivationWindow(BaseWindow, AsyncMixin):
     """Device activation window."""
@@ -29,7 +80,7 @@ class ActivationWindow(BaseWindow, AsyncMixin):
 
     def __init__(
         self,
-        system_initializer: Optional[SystemInitializer] = None,
+        system_initializer: Optional["SystemInitializer"] = None,
         parent: Optional = None,
     ):
         # QML related - must be created before super().__init__
@@ -40,14 +91,20 @@ class ActivationWindow(BaseWindow, AsyncMixin):
 
         # Component instance
         self.system_initializer = system_initializer
-        self.device_activator: Optional[DeviceActivator] = None
+        self.device_activator: Optional["DeviceActivator"] = None
 
         # Status management
         self.current_stage = None
         self.activation_data = None
         self.is_activated = False
-        self.initialization_started = False
         self.status_message = ""
+        self.status_label = None
+
+        # Activation page URL, read from the configuration on the first click
+        self._ota_url: Optional[str] = None
+
+        # Last activation status shown by the model, repeated updates are skipped
+        self._last_status = None
 
         # Asynchronous signal transmitter
         self.signal_emitter = AsyncSignalEmitter()
@@ -56,19 +113,21 @@ class ActivationWindow(BaseWindow, AsyncMixin):
         # Window drag related
         self.drag_position = None
 
+        # Drag moves are coalesced, only the latest position is applied per tick
+        self._pending_drag_pos = None
+        self._drag_timer = QTimer(self)
+        self._drag_timer.setSingleShot(True)
+        self._drag_timer.setInterval(8)
+        self._drag_timer.timeout.connect(self._apply_pending_drag)
+
         # Delayed startup initialization (after the event loop has run)
-        self.start_update_timer(100)  # Initialization starts after 100ms
+        QTimer.singleShot(0, self._start_init_once)
 
     def _setup_ui(self):
         """Setup UI."""
         # Set up a borderless window
-        # Detect display server type for Wayland compatibility
-        import os
-
-        is_wayland = (
-            os.environ.get("WAYLAND_DISPLAY")
-            or os.environ.get("XDG_SESSION_TYPE") == "wayland"
-        )
+        is_wayland = _IS_WAYLAND
+        self._is_wayland = is_wayland
 
         if is_wayland:
             # Wayland environment: don't use WindowStaysOnTopHint (not supported)
@@ -87,8 +146,19 @@ class ActivationWindow(BaseWindow, AsyncMixin):
         self.setCentralWidget(central_widget)
 
         # Create layout
-        layout = QVBoxLayout(central_widget)
-        layout.setContentsMargins(0, 0, 0, 0)
+        self._central_layout = QVBoxLayout(central_widget)
+        self._central_layout.setContentsMargins(0, 0, 0, 0)
+
+        # Set adaptive size
+        self._setup_adaptive_size()
+
+        # Compiling the QML would block the first paint, so load it on the next
+        # event loop iteration once the window can already be shown
+        QTimer.singleShot(0, self._load_qml)
+
+    def _load_qml(self):
+        """Create the QML widget and load the activation view."""
+        is_wayland = self._is_wayland
 
         # Create QML widget
         self.qml_widget = QQuickWidget()
@@ -100,13 +170,14 @@ class ActivationWindow(BaseWindow, AsyncMixin):
 
         self.qml_widget.setClearColor(Qt.transparent)
 
-        # Register the data model to the QML context
-        qml_context = self.qml_widget.rootContext()
-        qml_context.setContextProperty("activationModel", self.activation_model)
+        # Register the data model as a QML singleton, the engine must not take
+        # ownership of it since the window keeps using it
+        _register_activation_model()
+        self.qml_widget.engine().setProperty("activationModel", self.activation_model)
+        QQmlEngine.setObjectOwnership(self.activation_model, QQmlEngine.CppOwnership)
 
         # Load QML file
-        qml_file = Path(__file__).parent / "activation_window.qml"
-        self.qml_widget.setSource(QUrl.fromLocalFile(str(qml_file)))
+        self.qml_widget.setSource(_QML_URL)
 
         # Check if QML is loaded successfully
         if self.qml_widget.status() == QQuickWidget.Error:
@@ -120,13 +191,11 @@ class ActivationWindow(BaseWindow, AsyncMixin):
                 self.logger.info("Use command: python main.py --mode cli")
 
         # Add to layout
-        layout.addWidget(self.qml_widget)
-
-        # Set adaptive size
-        self._setup_adaptive_size()
+        self._central_layout.addWidget(self.qml_widget)
 
-        # Lazy setting up of connections to ensure QML is fully loaded
-        self._setup_qml_connections()
+        # Connect QML signals only once the view has loaded
+        if self.qml_widget.status() == QQuickWidget.Ready:
+            self._setup_qml_connections()
 
     def _setup_adaptive_size(self):
         """Set adaptive window size."""
@@ -139,16 +208,17 @@ class ActivationWindow(BaseWindow, AsyncMixin):
         self.logger.info(f"Screen resolution detected: {screen_width}x{screen_height}")
 
         # Choose the appropriate window size based on screen size
+        style_sheet = ""
         if screen_width <= 480 or screen_height <= 320:
             # Very small screen (such as 3.5 inches 480x320)
             window_width, window_height = 450, 250
             self.setMinimumSize(QSize(450, 250))
-            self._apply_compact_styles()
+            style_sheet = _COMPACT_STYLE_SHEET
         elif screen_width <= 800 or screen_height <= 480:
             # Small screen (e.g. 7 inches 800x480)
             window_width, window_height = 480, 280
             self.setMinimumSize(QSize(480, 280))
-            self._apply_small_screen_styles()
+            style_sheet = _SMALL_SCREEN_STYLE_SHEET
         elif screen_width <= 1024 or screen_height <= 600:
             # medium screen
             window_width, window_height = 520, 300
@@ -164,33 +234,15 @@ class ActivationWindow(BaseWindow, AsyncMixin):
 
         self.resize(max_width, max_height)
 
+        # Setting a style sheet re-polishes every child, so only do it when needed
+        if style_sheet:
+            self.setStyleSheet(style_sheet)
+
         # Center display
         self.move((screen_width - max_width) // 2, (screen_height - max_height) // 2)
 
         self.logger.info(f"Set window size: {max_width}x{max_height}")
 
-    def _apply_compact_styles(self):
-        """Apply compact styles - suitable for extremely small screens"""
-        # Adjust font size
-        self.setStyleSheet(
-            """
-            QLabel { font-size: 10px; }
-            QPushButton { font-size: 10px; padding: 4px 8px; }
-            QTextEdit { font-size: 8px; }
-        """
-        )
-
-    def _apply_small_screen_styles(self):
-        """Apply small screen style."""
-        # Adjust font size
-        self.setStyleSheet(
-            """
-            QLabel { font-size: 11px; }
-            QPushButton { font-size: 11px; padding: 6px 10px; }
-            QTextEdit { font-size: 9px; }
-        """
-        )
-
     def _setup_connections(self):
         """Set up signal connections."""
         # Connect data model signals
@@ -213,45 +265,50 @@ class ActivationWindow(BaseWindow, AsyncMixin):
             self.logger.warning("QML root object not found, unable to set signal connection")
 
     def _setup_signal_connections(self):
-        """Set up an asynchronous signal connection."""
-        self.signal_emitter.status_changed.connect(self._on_status_changed)
-        self.signal_emitter.error_occurred.connect(self._on_error_occurred)
-        self.signal_emitter.data_ready.connect(self._on_data_ready)
-
-    def _on_timer_update(self):
-        """Timer update callback - start initialization"""
-        if not self.initialization_started:
-            self.initialization_started = True
-            self.stop_update_timer()  # Stop timer
-
-            # Only start initialization if there is a system initializer
-            if self.system_initializer is not None:
-                # The event loop should now be running and async tasks can be created
-                try:
-                    self.create_task(self._start_initialization(), "initialization")
-                except RuntimeError as e:
-                    self.logger.error(f"Failed to create initialization task: {e}")
-                    # If it still fails, try again
-                    self.start_update_timer(500)
-            else:
-                self.logger.info("No system initializer, skip automatic initialization")
+        """Set up an asynchronous signal connection.
+
+        The slots are queued, so they run on the GUI event loop one tick after
+        the emit rather than inside the emitting task."""
+        self.signal_emitter.status_changed.connect(
+            self._on_status_changed, Qt.QueuedConnection
+        )
+        self.signal_emitter.error_occurred.connect(
+            self._on_error_occurred, Qt.QueuedConnection
+        )
+        self.signal_emitter.data_ready.connect(self._on_data_ready, Qt.QueuedConnection)
+
+    def _start_init_once(self):
+        """Start initialization once the event loop is running."""
+        # Only start initialization if there is a system initializer
+        if self.system_initializer is not None:
+            # The event loop should now be running and async tasks can be created
+            try:
+                self.create_task(self._start_initialization(), "initialization")
+            except RuntimeError as e:
+                self.logger.error(f"Failed to create initialization task: {e}")
+                # If it still fails, try again
+                QTimer.singleShot(500, self._start_init_once)
+        else:
+            self.logger.info("No system initializer, skip automatic initialization")
 
     async def _start_initialization(self):
         """Start the system initialization process."""
         try:
             # If a SystemInitializer instance has been provided, use it directly
             if self.system_initializer:
-                self._update_device_info()
+                await self._update_device_info()
                 await self._start_activation_process()
             else:
                 # Otherwise create a new instance and run initialization
+                from src.core.system_initializer import SystemInitializer
+
                 self.system_initializer = SystemInitializer()
 
                 # Run the initialization process
                 init_result = await self.system_initializer.run_initialization()
 
                 if init_result.get("success", False):
-                    self._update_device_info()
+                    await self._update_device_info()
 
                     # Show status message
                     self.status_message = init_result.get("status_message", "")
@@ -273,7 +330,7 @@ class ActivationWindow(BaseWindow, AsyncMixin):
             self.logger.error(f"Initialization process exception: {e}", exc_info=True)
             self.signal_emitter.emit_error(f"Initialization exception: {e}")
 
-    def _update_device_info(self):
+    async def _update_device_info(self):
         """Update device information display."""
         if (
             not self.system_initializer
@@ -282,17 +339,22 @@ class ActivationWindow(BaseWindow, AsyncMixin):
             return
 
         device_fp = self.system_initializer.device_fingerprint
+        system_initializer = self.system_initializer
 
-        # Update serial number
-        serial_number = device_fp.get_serial_number()
-        self.activation_model.serialNumber = serial_number if serial_number else "--"
+        def read_device_info():
+            return (
+                device_fp.get_serial_number(),
+                device_fp.get_mac_address_from_efuse(),
+                system_initializer.get_activation_status(),
+            )
 
-        # Update MAC address
-        mac_address = device_fp.get_mac_address_from_efuse()
-        self.activation_model.macAddress = mac_address if mac_address else "--"
+        # The reads touch device files, keep them off the GUI thread
+        loop = asyncio.get_running_loop()
+        serial_number, mac_address, activation_status = await loop.run_in_executor(
+            None, read_device_info
+        )
 
         # Get activation status
-        activation_status = self.system_initializer.get_activation_status()
         local_activated = activation_status.get("local_activated", False)
         server_activated = activation_status.get("server_activated", False)
         status_consistent = activation_status.get("status_consistent", True)
@@ -300,18 +362,19 @@ class ActivationWindow(BaseWindow, AsyncMixin):
         # Update activation status display
         self.is_activated = local_activated
 
-        if not status_consistent:
-            self.activation_model.set_status_inconsistent(
-                local_activated, server_activated
-            )
-        else:
-            if local_activated:
-                self.activation_model.set_status_activated()
-            else:
-                self.activation_model.set_status_not_activated()
+        self._last_status = self.activation_model.get_status(
+            local_activated, server_activated, status_consistent
+        )
 
-        # Initialization activation code display
-        self.activation_model.reset_activation_code()
+        # Device information, activation status and the initial activation code
+        # display are applied in one batch, notifying QML once per change
+        status, color = self._last_status
+        self.activation_model.update_all(
+            serial_number if serial_number else "--",
+            mac_address if mac_address else "--",
+            status,
+            color,
+        )
 
     async def _start_activation_process(self):
         """Start the activation process."""
@@ -329,14 +392,19 @@ class ActivationWindow(BaseWindow, AsyncMixin):
             self._show_activation_info(activation_data)
 
             # Initialize device activator
+            from src.utils.device_activator import DeviceActivator
+
             config_manager = self.system_initializer.get_config_manager()
             self.device_activator = DeviceActivator(config_manager)
 
             # Start activation process
             self.signal_emitter.emit_status("Begin the device activation process...")
-            activation_success = await self.device_activator.process_activation(
-                activation_data
-            )
+            try:
+                activation_success = await self.device_activator.process_activation(
+                    activation_data
+                )
+            finally:
+                await self.device_activator.aclose()
 
             # Check if the cancellation was because the window was closed
             if self.is_shutdown_requested():
@@ -367,7 +435,9 @@ class ActivationWindow(BaseWindow, AsyncMixin):
     def _on_activation_success(self):
         """Activation processed successfully."""
         # Update status display
-        self.activation_model.set_status_activated()
+        if self._last_status != ActivationModel.STATUS_ACTIVATED:
+            self._last_status = ActivationModel.STATUS_ACTIVATED
+            self.activation_model.set_status_activated()
 
         # Transmission completion signal
         self.activation_completed.emit(True)
@@ -401,10 +471,16 @@ class ActivationWindow(BaseWindow, AsyncMixin):
         # Get activation URL from configuration and open
         try:
             from src.utils.common_utils import open_url
-            from src.utils.config_manager import ConfigManager
 
-            config = ConfigManager.get_instance()
-            ota_url = config.get_config("SYSTEM_OPTIONS.NETWORK.AUTHORIZATION_URL", "")
+            if not self._ota_url:
+                from src.utils.config_manager import ConfigManager
+
+                config = ConfigManager.get_instance()
+                self._ota_url = config.get_config(
+                    "SYSTEM_OPTIONS.NETWORK.AUTHORIZATION_URL", ""
+                )
+
+            ota_url = self._ota_url
             if ota_url:
                 open_url(ota_url)
                 self.update_status("The activation page has been opened, please enter the verification code in the browser")
@@ -417,26 +493,23 @@ class ActivationWindow(BaseWindow, AsyncMixin):
 
     def _on_copy_code_clicked(self):
         """Click the Copy Verification Code button."""
-        if self.activation_data:
-            code = self.activation_data.get("code", "")
-            if code:
-                clipboard = QApplication.clipboard()
-                clipboard.setText(code)
-                self.update_status(f"Verification code copied to clipboard: {code}")
-        else:
+        code = (self.activation_data or {}).get("code")
+        if not code:
             # Get activation code from model
             code = self.activation_model.activationCode
-            if code and code != "--":
-                clipboard = QApplication.clipboard()
-                clipboard.setText(code)
-                self.update_status(f"Verification code copied to clipboard: {code}")
+            if code == "--":
+                code = None
+
+        if code:
+            QApplication.clipboard().setText(code)
+            self.update_status(f"Verification code copied to clipboard: {code}")
 
     def update_status(self, message: str):
         """Update status information."""
         self.logger.info(message)
 
         # If there is a status label, update it
-        if hasattr(self, "status_label"):
+        if self.status_label is not None:
             self.status_label.setText(message)
 
     def get_activation_result(self) -> dict:
@@ -478,11 +551,22 @@ class ActivationWindow(BaseWindow, AsyncMixin):
     def mouseMoveEvent(self, event):
         """Mouse movement event - implement window dragging."""
         if event.buttons() == Qt.LeftButton and self.drag_position:
-            self.move(event.globalPos() - self.drag_position)
+            self._pending_drag_pos = event.globalPos() - self.drag_position
+            if not self._drag_timer.isActive():
+                self._drag_timer.start()
             event.accept()
 
+    def _apply_pending_drag(self):
+        """Move the window to the latest drag position."""
+        if self._pending_drag_pos is not None:
+            self.move(self._pending_drag_pos)
+            self._pending_drag_pos = None
+
     def mouseReleaseEvent(self, event):
         """Mouse release event."""
+        # Land on the final position without waiting for the timer
+        self._drag_timer.stop()
+        self._apply_pending_drag()
         self.drag_position = None
 
     def _apply_native_rounded_corners(self):
@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
 """The CLI mode device activation process provides the same functionality as the GUI activation window, but uses pure terminal output."""
 
-from datetime import datetime
-from typing import Optional
+import asyncio
+import io
+import os
+import sys
+import time
+from typing import Optional, Tuple
 
 from src.core.system_initializer import SystemInitializer
 from src.utils.device_activator import DeviceActivator
@@ -10,6 +14,88 @@ from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Last formatted timestamp as [second, "HH:MM:SS"], reused within the same second
+_ts_cache = [0, ""]
+
+
+def _timestamp() -> str:
+    """Current time as "HH:MM:SS", formatted at most once per second."""
+    sec = int(time.time())
+    if sec != _ts_cache[0]:
+        _ts_cache[0] = sec
+        _ts_cache[1] = time.strftime("%H:%M:%S", time.localtime(sec))
+    return _ts_cache[1]
+
+
+# Static terminal screens, rendered once at import
+_SEPARATOR = "=" * 60
+
+_HEADER = "\n".join(
+    [
+        "",
+        _SEPARATOR,
+        "Xiaozhi AI Client - Device Activation Process",
+        _SEPARATOR,
+        "Initializing device, please wait...",
+        "",
+    ]
+)
+
+_ACTIVATION_INFO_TEMPLATE = "\n".join(
+    [
+        "",
+        _SEPARATOR,
+        "Device activation information",
+        _SEPARATOR,
+        "Activation verification code: {code}",
+        "Activation instructions: {message}",
+        _SEPARATOR,
+        "",
+        "Verification code (please enter on the website): {formatted_code}",
+        "",
+        "Please follow the steps below to complete activation:",
+        "1. Open the browser and visit xiaozhi.me",
+        "2. Log in to your account",
+        "3. Select Add Device",
+        "4. Enter the verification code: {formatted_code}",
+        "5. Confirm to add the device",
+        "",
+        "Waiting for activation confirmation, please complete the operation on the website...",
+    ]
+)
+
+_SUCCESS_BANNER = "\n".join(
+    [
+        "",
+        _SEPARATOR,
+        "Device activation successful!",
+        _SEPARATOR,
+        "The device has been successfully added to your account",
+        "Configuration has been updated automatically",
+        "Prepare to start Xiaozhi AI client...",
+        _SEPARATOR,
+    ]
+)
+
+_FAILURE_BANNER = "\n".join(
+    [
+        "",
+        _SEPARATOR,
+        "Device activation failed",
+        _SEPARATOR,
+        "Possible reasons:",
+        "• Unstable network connection",
+        "• The verification code was entered incorrectly or has expired",
+        "• Server temporarily unavailable",
+        "",
+        "Solution:",
+        "• Check network connection",
+        "• Rerun the program to get a new verification code",
+        "• Make sure you enter the verification code correctly on the website",
+        _SEPARATOR,
+    ]
+)
+
 
 class CLIActivation:
     """CLI mode device activation handler."""
@@ -24,8 +110,31 @@ class CLIActivation:
         self.activation_data = None
         self.is_activated = False
 
+        # (serial number, MAC address), fixed once the efuse identity exists
+        self._device_identity: Optional[Tuple[str, Optional[str]]] = None
+
         self.logger = logger
 
+        # Terminal output is collected and written to stdout in one go at the
+        # end of each screen, set XIAOZHI_LOG_UNBUFFERED to write every line
+        self._out = io.StringIO()
+        self._unbuffered = bool(os.environ.get("XIAOZHI_LOG_UNBUFFERED"))
+
+    def _write(self, text: str = ""):
+        """Queue a line (or a pre-rendered block) of terminal output."""
+        self._out.write(text + "\n")
+        if self._unbuffered:
+            self._flush()
+
+    def _flush(self):
+        """Write the queued terminal output to stdout."""
+        data = self._out.getvalue()
+        if data:
+            self._out.seek(0)
+            self._out.truncate()
+            sys.stdout.write(data)
+            sys.stdout.flush()
+
     async def run_activation_process(self) -> bool:
         """Run the complete CLI activation process.
 
@@ -44,8 +153,14 @@ class CLIActivation:
                 self._log_and_print("Start the system initialization process")
                 self.system_initializer = SystemInitializer()
 
-                # Run the initialization process
-                init_result = await self.system_initializer.run_initialization()
+                # Run the initialization process while a worker thread writes the
+                # header, so a slow terminal (e.g. over SSH) does not delay it.
+                # Nothing else writes terminal output until both are done.
+                loop = asyncio.get_running_loop()
+                _, init_result = await asyncio.gather(
+                    loop.run_in_executor(None, self._flush),
+                    self.system_initializer.run_initialization(),
+                )
 
                 if init_result.get("success", False):
                     self._update_device_info()
@@ -75,14 +190,12 @@ class CLIActivation:
             self.logger.error(f"CLI activation process exception: {e}", exc_info=True)
             self._log_and_print(f"Activation exception: {e}")
             return False
+        finally:
+            self._flush()
 
     def _print_header(self):
         """Print CLI activation process header information."""
-        print("\n" + "=" * 60)
-        print("Xiaozhi AI Client - Device Activation Process")
-        print("=" * 60)
-        print("Initializing device, please wait...")
-        print()
+        self._write(_HEADER)
 
     def _update_device_info(self):
         """Update device information display."""
@@ -95,8 +208,7 @@ class CLIActivation:
         device_fp = self.system_initializer.device_fingerprint
 
         # Get device information
-        serial_number = device_fp.get_serial_number()
-        mac_address = device_fp.get_mac_address_from_efuse()
+        serial_number, mac_address = self._get_device_identity(device_fp)
 
         # Get activation status
         activation_status = self.system_initializer.get_activation_status()
@@ -107,11 +219,6 @@ class CLIActivation:
         # Update activation status
         self.is_activated = local_activated
 
-        # Show device information
-        print("📱Device information:")
-        print(f"Serial number: {serial_number if serial_number else '--'}")
-        print(f"MAC address: {mac_address if mac_address else '--'}")
-
         # Show activation status
         if not status_consistent:
             if local_activated and not server_activated:
@@ -121,7 +228,29 @@ class CLIActivation:
         else:
             status_text = "Activated" if local_activated else "Not activated"
 
-        print(f"Activation status: {status_text}")
+        # Show device information and activation status as one block
+        self._write(
+            "\n".join(
+                [
+                    "📱Device information:",
+                    f"Serial number: {serial_number or '--'}",
+                    f"MAC address: {mac_address or '--'}",
+                    f"Activation status: {status_text}",
+                ]
+            )
+        )
+        self._flush()
+
+    def _get_device_identity(self, device_fp) -> Tuple[Optional[str], Optional[str]]:
+        """Get the serial number and MAC address, read once per activation run."""
+        if self._device_identity is None:
+            serial_number = device_fp.get_serial_number()
+            mac_address = device_fp.get_mac_address_from_efuse()
+            if not serial_number:
+                # Not generated yet, read again next time
+                return serial_number, mac_address
+            self._device_identity = (serial_number, mac_address)
+        return self._device_identity
 
     async def _start_activation_process(self) -> bool:
         """Start the activation process."""
@@ -131,7 +260,7 @@ class CLIActivation:
 
             if not activation_data:
                 self._log_and_print("\nActivation data not obtained")
-                print("Error: Activation data not obtained, please check the network connection")
+                self._write("Error: Activation data not obtained, please check the network connection")
                 return False
 
             self.activation_data = activation_data
@@ -145,11 +274,15 @@ class CLIActivation:
 
             # Start activation process
             self._log_and_print("\nStart the device activation process...")
-            print("Connecting to activation server, please maintain network connection...")
+            self._write("Connecting to activation server, please maintain network connection...")
+            self._flush()
 
-            activation_success = await self.device_activator.process_activation(
-                activation_data
-            )
+            try:
+                activation_success = await self.device_activator.process_activation(
+                    activation_data
+                )
+            finally:
+                await self.device_activator.aclose()
 
             if activation_success:
                 self._log_and_print("\nDevice activation successful!")
@@ -170,57 +303,31 @@ class CLIActivation:
         code = activation_data.get("code", "------")
         message = activation_data.get("message", "Please visit xiaozhi.me to enter the verification code")
 
-        print("\n" + "=" * 60)
-        print("Device activation information")
-        print("=" * 60)
-        print(f"Activation verification code: {code}")
-        print(f"Activation instructions: {message}")
-        print("=" * 60)
-
         # Formatted display of verification code (add spaces between each character)
         formatted_code = " ".join(code)
-        print(f"\nVerification code (please enter on the website): {formatted_code}")
-        print("\nPlease follow the steps below to complete activation:")
-        print("1. Open the browser and visit xiaozhi.me")
-        print("2. Log in to your account")
-        print("3. Select Add Device")
-        print(f"4. Enter the verification code: {formatted_code}")
-        print("5. Confirm to add the device")
-        print("\nWaiting for activation confirmation, please complete the operation on the website...")
+        self._write(
+            _ACTIVATION_INFO_TEMPLATE.format(
+                code=code, message=message, formatted_code=formatted_code
+            )
+        )
 
         self._log_and_print(f"Activation verification code: {code}")
         self._log_and_print(f"Activation instructions: {message}")
+        self._flush()
 
     def _print_activation_success(self):
         """Print activation success message."""
-        print("\n" + "=" * 60)
-        print("Device activation successful!")
-        print("=" * 60)
-        print("The device has been successfully added to your account")
-        print("Configuration has been updated automatically")
-        print("Prepare to start Xiaozhi AI client...")
-        print("=" * 60)
+        self._write(_SUCCESS_BANNER)
+        self._flush()
 
     def _print_activation_failure(self):
         """Print activation failure information."""
-        print("\n" + "=" * 60)
-        print("Device activation failed")
-        print("=" * 60)
-        print("Possible reasons:")
-        print("• Unstable network connection")
-        print("• The verification code was entered incorrectly or has expired")
-        print("• Server temporarily unavailable")
-        print("\nSolution:")
-        print("• Check network connection")
-        print("• Rerun the program to get a new verification code")
-        print("• Make sure you enter the verification code correctly on the website")
-        print("=" * 60)
+        self._write(_FAILURE_BANNER)
+        self._flush()
 
     def _log_and_print(self, message: str):
         """Simultaneously log and print to the terminal."""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_message = f"[{timestamp}] {message}"
-        print(log_message)
+        self._write(f"[{_timestamp()}] {message}")
         self.logger.info(message)
 
     def get_activation_result(self) -> dict:
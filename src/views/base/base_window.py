@@ -3,7 +3,7 @@
 Supports asynchronous operations and qasync integration"""
 
 import asyncio
-from typing import Optional
+from typing import Optional, Set
 
 from PyQt5.QtCore import QTimer, pyqtSignal
 from PyQt5.QtWidgets import QMainWindow, QWidget
@@ -24,10 +24,14 @@ class BaseWindow(QMainWindow):
         super().__init__(parent)
         self.logger = get_logger(self.__class__.__name__)
 
-        # Asynchronous task management
-        self._tasks = set()
+        # Asynchronous task management. The event loop only keeps weak references
+        # to tasks, so pending ones are held here until their done callback
+        self._tasks: Set[asyncio.Task] = set()
         self._shutdown_event = asyncio.Event()
 
+        # Activation windows assign their DeviceActivator here
+        self.device_activator = None
+
         # Timers are used to update the UI periodically (in conjunction with asynchronous operations)
         self._update_timer = QTimer()
         self._update_timer.timeout.connect(self._on_timer_update)
@@ -65,15 +69,18 @@ class BaseWindow(QMainWindow):
         """Create asynchronous tasks and manage them."""
         task = asyncio.create_task(coro, name=name)
         self._tasks.add(task)
-
-        def done_callback(t):
-            self._tasks.discard(t)
-            if not t.cancelled() and t.exception():
-                self.logger.error(f"Asynchronous task exception: {t.exception()}", exc_info=True)
-
-        task.add_done_callback(done_callback)
+        task.add_done_callback(self._on_task_done)
         return task
 
+    def _on_task_done(self, task: asyncio.Task):
+        """Forget a finished task and log its exception, if any."""
+        self._tasks.discard(task)
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            self.logger.error("Asynchronous task exception: %s", exc, exc_info=exc)
+
     async def shutdown_async(self):
         """Close the window asynchronously."""
         self.logger.info("Start closing window asynchronously")
@@ -84,14 +91,26 @@ class BaseWindow(QMainWindow):
         # Stop timer
         self.stop_update_timer()
 
-        # Cancel all tasks
-        for task in self._tasks.copy():
-            if not task.done():
-                task.cancel()
-
-        # Wait for task to complete
-        if self._tasks:
-            await asyncio.gather(*self._tasks, return_exceptions=True)
+        # Cancel all tasks, the snapshot keeps them alive until they finish
+        tasks = [task for task in self._tasks if not task.done()]
+        for task in tasks:
+            task.cancel()
+
+        # Wait for task to complete, waking up as each one finishes
+        pending = set(tasks)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + 5.0
+        while pending:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                self.logger.warning(f"{len(pending)} tasks did not finish before closing")
+                break
+            done, pending = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if not task.cancelled() and task.exception():
+                    self.logger.debug(f"Task ended with exception during shutdown: {task.exception()}")
 
         self.logger.info("The window is closed asynchronously")
 
@@ -103,7 +122,7 @@ class BaseWindow(QMainWindow):
         self._shutdown_event.set()
 
         # If it is an activation window, cancel the activation process
-        if hasattr(self, "device_activator") and self.device_activator:
+        if self.device_activator is not None:
             self.device_activator.cancel_activation()
             self.logger.info("Activation cancellation signal sent")
 
@@ -114,7 +133,7 @@ class BaseWindow(QMainWindow):
         self.stop_update_timer()
 
         # Cancel all tasks (synchronous mode)
-        for task in self._tasks.copy():
+        for task in tuple(self._tasks):
             if not task.done():
                 task.cancel()
 
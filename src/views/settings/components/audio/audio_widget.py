@@ -1,10 +1,12 @@
+import collections
+import math
 import threading
 import time
 from pathlib import Path
 
 import numpy as np
 import sounddevice as sd
-from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
 from PyQt5.QtWidgets import (
     QComboBox,
     QLabel,
@@ -17,15 +19,180 @@ from PyQt5.QtWidgets import (
 from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
 
+# Device enumeration is slow on some host APIs (WASAPI/WDM-KS), so the result
+# is shared between widget instances for a short while
+_DEVICES_CACHE_TTL = 30.0
+_DEVICES_CACHE = {
+    "ts": 0.0,
+    "devices": None,
+    "hostapis": None,
+    "defaults": None,
+    "records": None,
+}
+
+# Host API preference when the same device is listed under several of them,
+# lower wins. Unknown host APIs come last
+_HOSTAPI_PRIORITY = {
+    "Windows WASAPI": 0,
+    "Windows DirectSound": 1,
+    "MME": 2,
+    "Windows WDM-KS": 3,
+    "Core Audio": 0,
+    "ALSA": 0,
+    "JACK Audio Connection Kit": 1,
+    "OSS": 2,
+}
+
+
+def _get_cached_devices(force: bool = False):
+    """Return (devices, hostapis, (default_input, default_output)), querying
+    PortAudio only when the cache is empty, expired or ``force`` is set."""
+    now = time.monotonic()
+    if (
+        not force
+        and _DEVICES_CACHE["devices"] is not None
+        and now - _DEVICES_CACHE["ts"] < _DEVICES_CACHE_TTL
+    ):
+        return (
+            _DEVICES_CACHE["devices"],
+            _DEVICES_CACHE["hostapis"],
+            _DEVICES_CACHE["defaults"],
+        )
+
+    default_device = sd.default.device
+    defaults = (
+        (default_device[0], default_device[1]) if default_device else (None, None)
+    )
+    devices = sd.query_devices()
+    hostapis = sd.query_hostapis()
+    _DEVICES_CACHE.update(
+        ts=now, devices=devices, hostapis=hostapis, defaults=defaults, records=None
+    )
+    return devices, hostapis, defaults
+
+
+def _invalidate_cache():
+    """Drop the cached device list so the next scan queries PortAudio again."""
+    _DEVICES_CACHE.update(
+        ts=0.0, devices=None, hostapis=None, defaults=None, records=None
+    )
+
+
+def _enumerate_devices(force: bool = False, keep_ids=()):
+    """Split the device list into input and output entries.
+
+    A device listed under several host APIs (e.g. MME, DirectSound and WASAPI on
+    Windows) is kept once, from the preferred host API. The system default and
+    ``keep_ids`` (the configured devices) always win within their name so
+    existing selections stay available.
+
+    The records are built once per PortAudio query and shared by later scans,
+    callers must treat the returned lists as read-only.
+
+    Returns:
+        tuple: (input_devices, output_devices, default_input, default_output)"""
+    devices, hostapis, (default_input, default_output) = _get_cached_devices(force)
+    keep_ids = frozenset(i for i in keep_ids if i is not None)
+    cached = _DEVICES_CACHE["records"]
+    if cached is not None and cached[0] == keep_ids:
+        return cached[1]
+
+    # raw name -> (rank, record), per direction
+    inputs = {}
+    outputs = {}
+    for i, dev_info in enumerate(devices):
+        device_name = dev_info["name"]
+        api_rank = _HOSTAPI_PRIORITY.get(
+            hostapis[dev_info["hostapi"]]["name"], len(_HOSTAPI_PRIORITY)
+        )
+
+        # Add input device
+        if dev_info["max_input_channels"] > 0:
+            is_default = i == default_input
+            rank = (not (is_default or i in keep_ids), api_rank)
+            if device_name not in inputs or rank < inputs[device_name][0]:
+                inputs[device_name] = (
+                    rank,
+                    {
+                        "id": i,
+                        "name": device_name + ("(default)" if is_default else ""),
+                        "raw_name": device_name,
+                        "channels": dev_info["max_input_channels"],
+                        "sample_rate": dev_info["default_samplerate"],
+                    },
+                )
+
+        # Add output device
+        if dev_info["max_output_channels"] > 0:
+            is_default = i == default_output
+            rank = (not (is_default or i in keep_ids), api_rank)
+            if device_name not in outputs or rank < outputs[device_name][0]:
+                outputs[device_name] = (
+                    rank,
+                    {
+                        "id": i,
+                        "name": device_name + ("(default)" if is_default else ""),
+                        "raw_name": device_name,
+                        "channels": dev_info["max_output_channels"],
+                        "sample_rate": dev_info["default_samplerate"],
+                    },
+                )
+
+    # Keep PortAudio's device order
+    input_devices = sorted((r for _, r in inputs.values()), key=lambda d: d["id"])
+    output_devices = sorted((r for _, r in outputs.values()), key=lambda d: d["id"])
+
+    records = (input_devices, output_devices, default_input, default_output)
+    _DEVICES_CACHE["records"] = (keep_ids, records)
+    return records
+
+
+class _ScanSignals(QObject):
+    """Signals of _ScanWorker, delivered to the widget on the main thread."""
+
+    devices_ready = pyqtSignal(list, list, object, object)
+    scan_failed = pyqtSignal(str)
+
+
+class _ScanWorker(QRunnable):
+    """Enumerates audio devices on a QThreadPool thread."""
+
+    def __init__(self, force: bool = False, keep_ids=()):
+        super().__init__()
+        self.force = force
+        self.keep_ids = keep_ids
+        self.signals = _ScanSignals()
+
+    def run(self):
+        try:
+            self.signals.devices_ready.emit(
+                *_enumerate_devices(self.force, self.keep_ids)
+            )
+        except Exception as e:
+            get_logger(__name__).error(f"Scan for audio device failed: {e}", exc_info=True)
+            self.signals.scan_failed.emit(str(e))
+
+
+class _TestWorker(QRunnable):
+    """Runs a device test on a QThreadPool thread."""
+
+    def __init__(self, fn, *args):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+
+    def run(self):
+        self.fn(*self.args)
+
 
 class AudioWidget(QWidget):
     """Audio device settings component."""
 
     # Signal definition
     settings_changed = pyqtSignal()
-    status_message = pyqtSignal(str)
     reset_input_ui = pyqtSignal()
     reset_output_ui = pyqtSignal()
+    status_pending = pyqtSignal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -35,25 +202,39 @@ class AudioWidget(QWidget):
         # UI control reference
         self.ui_controls = {}
 
-        # Device data
+        # Device data, filled in by the background scan
         self.input_devices = []
         self.output_devices = []
+        self._input_by_id = {}
+        self._output_by_id = {}
+        self._default_input_id = None
+        self._default_output_id = None
+        self._scan_worker = None
 
         # test status
         self.testing_input = False
         self.testing_output = False
+        # Running test countdowns, timer -> cancel callback
+        self._countdowns = {}
+
+        # Status lines queued by any thread, appended to status_text in batches.
+        # The drain timer only runs while lines are pending
+        self._pending_status = collections.deque(maxlen=1024)
+        self._status_scheduled = False
+        self._status_timer = QTimer(self)
+        self._status_timer.setInterval(50)
+        self._status_timer.timeout.connect(self._drain_status)
 
         # Initialize UI
         self._setup_ui()
         self._connect_events()
         self._scan_devices()
-        self._load_config_values()
 
         # Connect thread-safe UI update signals
         try:
-            self.status_message.connect(self._on_status_message)
             self.reset_input_ui.connect(self._reset_input_test_ui)
             self.reset_output_ui.connect(self._reset_output_test_ui)
+            self.status_pending.connect(self._start_status_timer)
         except Exception:
             pass
 
@@ -73,44 +254,56 @@ class AudioWidget(QWidget):
             raise
 
     def _get_ui_controls(self):
-        """Get the UI control reference."""
+        """Get the UI control reference.
+
+        The controls are bound as attributes for the slots below, ui_controls keeps
+        the same mapping as the other settings components."""
+        self.input_device_combo = self.findChild(QComboBox, "input_device_combo")
+        self.output_device_combo = self.findChild(QComboBox, "output_device_combo")
+        self.input_info_label = self.findChild(QLabel, "input_info_label")
+        self.output_info_label = self.findChild(QLabel, "output_info_label")
+        self.test_input_btn = self.findChild(QPushButton, "test_input_btn")
+        self.test_output_btn = self.findChild(QPushButton, "test_output_btn")
+        self.scan_devices_btn = self.findChild(QPushButton, "scan_devices_btn")
+        self.status_text = self.findChild(QTextEdit, "status_text")
+
         self.ui_controls.update(
             {
-                "input_device_combo": self.findChild(QComboBox, "input_device_combo"),
-                "output_device_combo": self.findChild(QComboBox, "output_device_combo"),
-                "input_info_label": self.findChild(QLabel, "input_info_label"),
-                "output_info_label": self.findChild(QLabel, "output_info_label"),
-                "test_input_btn": self.findChild(QPushButton, "test_input_btn"),
-                "test_output_btn": self.findChild(QPushButton, "test_output_btn"),
-                "scan_devices_btn": self.findChild(QPushButton, "scan_devices_btn"),
-                "status_text": self.findChild(QTextEdit, "status_text"),
+                "input_device_combo": self.input_device_combo,
+                "output_device_combo": self.output_device_combo,
+                "input_info_label": self.input_info_label,
+                "output_info_label": self.output_info_label,
+                "test_input_btn": self.test_input_btn,
+                "test_output_btn": self.test_output_btn,
+                "scan_devices_btn": self.scan_devices_btn,
+                "status_text": self.status_text,
             }
         )
 
     def _connect_events(self):
         """Connection event handling."""
         # Device selection changes
-        if self.ui_controls["input_device_combo"]:
-            self.ui_controls["input_device_combo"].currentTextChanged.connect(
+        if self.input_device_combo:
+            self.input_device_combo.currentTextChanged.connect(
                 self._on_input_device_changed
             )
 
-        if self.ui_controls["output_device_combo"]:
-            self.ui_controls["output_device_combo"].currentTextChanged.connect(
+        if self.output_device_combo:
+            self.output_device_combo.currentTextChanged.connect(
                 self._on_output_device_changed
             )
 
         # button click
-        if self.ui_controls["test_input_btn"]:
-            self.ui_controls["test_input_btn"].clicked.connect(self._test_input_device)
+        if self.test_input_btn:
+            self.test_input_btn.clicked.connect(self._test_input_device)
 
-        if self.ui_controls["test_output_btn"]:
-            self.ui_controls["test_output_btn"].clicked.connect(
-                self._test_output_device
-            )
+        if self.test_output_btn:
+            self.test_output_btn.clicked.connect(self._test_output_device)
 
-        if self.ui_controls["scan_devices_btn"]:
-            self.ui_controls["scan_devices_btn"].clicked.connect(self._scan_devices)
+        if self.scan_devices_btn:
+            self.scan_devices_btn.clicked.connect(
+                lambda: self._scan_devices(force=True)
+            )
 
     def _on_input_device_changed(self):
         """Input device change event."""
@@ -126,80 +319,57 @@ class AudioWidget(QWidget):
         """Update device information display."""
         try:
             # Update input device information
-            input_device_id = self.ui_controls["input_device_combo"].currentData()
+            input_device_id = self.input_device_combo.currentData()
             if input_device_id is not None:
-                input_device = next(
-                    (d for d in self.input_devices if d["id"] == input_device_id), None
-                )
+                input_device = self._input_by_id.get(input_device_id)
                 if input_device:
                     info_text = f"Sampling rate: {int(input_device['sample_rate'])}Hz, Channel: {input_device['channels']}"
-                    self.ui_controls["input_info_label"].setText(info_text)
+                    self.input_info_label.setText(info_text)
                 else:
-                    self.ui_controls["input_info_label"].setText("Failed to obtain device information")
+                    self.input_info_label.setText("Failed to obtain device information")
             else:
-                self.ui_controls["input_info_label"].setText("No device selected")
+                self.input_info_label.setText("No device selected")
 
             # Update output device information
-            output_device_id = self.ui_controls["output_device_combo"].currentData()
+            output_device_id = self.output_device_combo.currentData()
             if output_device_id is not None:
-                output_device = next(
-                    (d for d in self.output_devices if d["id"] == output_device_id),
-                    None,
-                )
+                output_device = self._output_by_id.get(output_device_id)
                 if output_device:
                     info_text = f"Sampling rate: {int(output_device['sample_rate'])}Hz, Channel: {output_device['channels']}"
-                    self.ui_controls["output_info_label"].setText(info_text)
+                    self.output_info_label.setText(info_text)
                 else:
-                    self.ui_controls["output_info_label"].setText("Failed to obtain device information")
+                    self.output_info_label.setText("Failed to obtain device information")
             else:
-                self.ui_controls["output_info_label"].setText("No device selected")
+                self.output_info_label.setText("No device selected")
 
         except Exception as e:
             self.logger.error(f"Failed to update device information: {e}", exc_info=True)
 
-    def _scan_devices(self):
-        """Scan for audio devices."""
+    def _scan_devices(self, force: bool = False):
+        """Scan for audio devices in a worker thread, results arrive in _on_devices_ready."""
+        if self._scan_worker is not None:
+            return
+
+        self._append_status("Scanning audio devices...")
+        keep_ids = (
+            self.config_manager.get_config("AUDIO_DEVICES.input_device_id"),
+            self.config_manager.get_config("AUDIO_DEVICES.output_device_id"),
+        )
+        self._scan_worker = _ScanWorker(force, keep_ids)
+        self._scan_worker.signals.devices_ready.connect(self._on_devices_ready)
+        self._scan_worker.signals.scan_failed.connect(self._on_scan_failed)
+        QThreadPool.globalInstance().start(self._scan_worker)
+
+    def _on_devices_ready(self, input_devices, output_devices, default_input, default_output):
+        """Populate the device lists with the scan results (main thread)."""
+        self._scan_worker = None
         try:
-            self._append_status("Scanning audio devices...")
-
-            # Clear existing device list
-            self.input_devices.clear()
-            self.output_devices.clear()
-
-            # Get system default device
-            default_input = sd.default.device[0] if sd.default.device else None
-            default_output = sd.default.device[1] if sd.default.device else None
-
-            # Scan all devices
-            devices = sd.query_devices()
-            for i, dev_info in enumerate(devices):
-                device_name = dev_info["name"]
-
-                # Add input device
-                if dev_info["max_input_channels"] > 0:
-                    default_mark = "(default)" if i == default_input else ""
-                    self.input_devices.append(
-                        {
-                            "id": i,
-                            "name": device_name + default_mark,
-                            "raw_name": device_name,
-                            "channels": dev_info["max_input_channels"],
-                            "sample_rate": dev_info["default_samplerate"],
-                        }
-                    )
-
-                # Add output device
-                if dev_info["max_output_channels"] > 0:
-                    default_mark = "(default)" if i == default_output else ""
-                    self.output_devices.append(
-                        {
-                            "id": i,
-                            "name": device_name + default_mark,
-                            "raw_name": device_name,
-                            "channels": dev_info["max_output_channels"],
-                            "sample_rate": dev_info["default_samplerate"],
-                        }
-                    )
+            self.input_devices = input_devices
+            self.output_devices = output_devices
+            self._input_by_id = {d["id"]: d for d in input_devices}
+            self._output_by_id = {d["id"]: d for d in output_devices}
+            self._default_input_id = default_input
+            self._default_output_id = default_output
 
             # Update drop down box
             self._update_device_combos()
@@ -207,6 +377,9 @@ class AudioWidget(QWidget):
             # Automatically select default device
             self._select_default_devices()
 
+            # Restore the saved selection now that the combos are filled
+            self._load_config_values()
+
             self._append_status(
                 f"Scan completed: {len(self.input_devices)} input devices, {len(self.output_devices)} output devices found"
             )
@@ -215,40 +388,45 @@ class AudioWidget(QWidget):
             self.logger.error(f"Scan for audio device failed: {e}", exc_info=True)
             self._append_status(f"Scanning device failed: {str(e)}")
 
+    def _on_scan_failed(self, error: str):
+        """Report a failed device scan (main thread)."""
+        self._scan_worker = None
+        self._append_status(f"Scanning device failed: {error}")
+
     def _update_device_combos(self):
         """Update device dropdown box."""
         try:
-            # Save current selection
-            current_input = self.ui_controls["input_device_combo"].currentData()
-            current_output = self.ui_controls["output_device_combo"].currentData()
-
-            # Empty and repopulate input devices
-            self.ui_controls["input_device_combo"].clear()
-            for device in self.input_devices:
-                self.ui_controls["input_device_combo"].addItem(
-                    device["name"], device["id"]
-                )
+            self._fill_device_combo(
+                self.input_device_combo, self.input_devices
+            )
+            self._fill_device_combo(
+                self.output_device_combo, self.output_devices
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to update device dropdown: {e}", exc_info=True)
 
-            # Empty and repopulate the output device
-            self.ui_controls["output_device_combo"].clear()
-            for device in self.output_devices:
-                self.ui_controls["output_device_combo"].addItem(
-                    device["name"], device["id"]
-                )
+    def _fill_device_combo(self, combo, devices):
+        """Repopulate a device combo, keeping its selection if the device still exists.
 
-            # Try to restore previous selection
-            if current_input is not None:
-                index = self.ui_controls["input_device_combo"].findData(current_input)
-                if index >= 0:
-                    self.ui_controls["input_device_combo"].setCurrentIndex(index)
+        Signals are blocked while the items are replaced, the caller refreshes the
+        device information once both combos are filled."""
+        # Save current selection
+        current_id = combo.currentData()
 
-            if current_output is not None:
-                index = self.ui_controls["output_device_combo"].findData(current_output)
-                if index >= 0:
-                    self.ui_controls["output_device_combo"].setCurrentIndex(index)
+        combo.blockSignals(True)
+        try:
+            combo.clear()
+            combo.addItems([device["name"] for device in devices])
+            for i, device in enumerate(devices):
+                combo.setItemData(i, device["id"])
 
-        except Exception as e:
-            self.logger.error(f"Failed to update device dropdown: {e}", exc_info=True)
+            # Try to restore previous selection
+            if current_id is not None:
+                index = combo.findData(current_id)
+                if index >= 0:
+                    combo.setCurrentIndex(index)
+        finally:
+            combo.blockSignals(False)
 
     def _select_default_devices(self):
         """Automatically select the default device (consistent with the logic of audio_codec.py)."""
@@ -264,30 +442,26 @@ class AudioWidget(QWidget):
             # Select input device
             if config_input_id is not None:
                 # Use devices in configuration
-                index = self.ui_controls["input_device_combo"].findData(config_input_id)
+                index = self.input_device_combo.findData(config_input_id)
                 if index >= 0:
-                    self.ui_controls["input_device_combo"].setCurrentIndex(index)
+                    self.input_device_combo.setCurrentIndex(index)
             else:
-                # Automatically select default input devices (those marked "default")"标记的）
-                for i in range(self.ui_controls["input_device_combo"].count()):
-                    if "default" in self.ui_controls["input_device_combo"].itemText(i):
-                        self.ui_controls["input_device_combo"].setCurrentIndex(i)
-                        break
+                # Automatically select the system default input device
+                index = self.input_device_combo.findData(self._default_input_id)
+                if index >= 0:
+                    self.input_device_combo.setCurrentIndex(index)
 
             # Select output device
             if config_output_id is not None:
                 # Use devices in configuration
-                index = self.ui_controls["output_device_combo"].findData(
-                    config_output_id
-                )
+                index = self.output_device_combo.findData(config_output_id)
                 if index >= 0:
-                    self.ui_controls["output_device_combo"].setCurrentIndex(index)
+                    self.output_device_combo.setCurrentIndex(index)
             else:
-                # Automatically select the default output device (the one marked "Default")"标记的）
-                for i in range(self.ui_controls["output_device_combo"].count()):
-                    if "default" in self.ui_controls["output_device_combo"].itemText(i):
-                        self.ui_controls["output_device_combo"].setCurrentIndex(i)
-                        break
+                # Automatically select the system default output device
+                index = self.output_device_combo.findData(self._default_output_id)
+                if index >= 0:
+                    self.output_device_combo.setCurrentIndex(index)
 
             # Update device information display
             self._update_device_info()
@@ -301,51 +475,47 @@ class AudioWidget(QWidget):
             return
 
         try:
-            device_id = self.ui_controls["input_device_combo"].currentData()
+            device_id = self.input_device_combo.currentData()
             if device_id is None:
                 QMessageBox.warning(self, "hint", "Please select an input device first")
                 return
 
             self.testing_input = True
-            self.ui_controls["test_input_btn"].setEnabled(False)
-            self.ui_controls["test_input_btn"].setText("Recording...")
+            self.test_input_btn.setEnabled(False)
+            self.test_input_btn.setText("Recording...")
 
-            # Execute tests in a thread
-            test_thread = threading.Thread(
-                target=self._do_input_test, args=(device_id,)
+            # Get device information and sampling rate
+            input_device = self._input_by_id.get(device_id)
+            if not input_device:
+                self._append_status("Error: Unable to get device information")
+                self._reset_input_test_ui()
+                return
+
+            sample_rate = int(input_device["sample_rate"])
+            self._append_status(
+                f"Start recording test (device: {device_id}, sampling rate: {sample_rate}Hz)"
+            )
+            self._append_status("Please speak into the microphone, such as counting numbers: 1, 2, 3...")
+
+            # Count down on the GUI thread, the recording itself runs in the pool
+            self._start_countdown(
+                "Recording will start in {} seconds...",
+                lambda: QThreadPool.globalInstance().start(
+                    _TestWorker(self._do_input_test, device_id, sample_rate)
+                ),
+                self._reset_input_test_ui,
             )
-            test_thread.daemon = True
-            test_thread.start()
 
         except Exception as e:
             self.logger.error(f"Test input device failed: {e}", exc_info=True)
             self._append_status(f"Input device test failed: {str(e)}")
             self._reset_input_test_ui()
 
-    def _do_input_test(self, device_id):
+    def _do_input_test(self, device_id, sample_rate):
         """Perform input device testing."""
         try:
-            # Get device information and sampling rate
-            input_device = next(
-                (d for d in self.input_devices if d["id"] == device_id), None
-            )
-            if not input_device:
-                self._append_status_threadsafe("Error: Unable to get device information")
-                return
-
-            sample_rate = int(input_device["sample_rate"])
             duration = 3  # Recording duration 3 seconds
 
-            self._append_status_threadsafe(
-                f"Start recording test (device: {device_id}, sampling rate: {sample_rate}Hz)"
-            )
-            self._append_status_threadsafe("Please speak into the microphone, such as counting numbers: 1, 2, 3...")
-
-            # Countdown reminder
-            for i in range(3, 0, -1):
-                self._append_status_threadsafe(f"Recording will start in {i} seconds...")
-                time.sleep(1)
-
             self._append_status_threadsafe("Recording, please speak... (3 seconds)")
 
             # recording
@@ -360,19 +530,27 @@ class AudioWidget(QWidget):
 
             self._append_status_threadsafe("Recording completed, analyzing...")
 
-            # Analyze recording quality
-            max_amplitude = np.max(np.abs(recording))
-            rms = np.sqrt(np.mean(recording**2))
-
-            # Detect if there is voice activity
-            frame_length = int(0.1 * sample_rate)  # 100ms frame
-            frames = []
-            for i in range(0, len(recording) - frame_length, frame_length):
-                frame_rms = np.sqrt(np.mean(recording[i : i + frame_length] ** 2))
-                frames.append(frame_rms)
-
-            active_frames = sum(1 for f in frames if f > 0.01)  # active frames
-            activity_ratio = active_frames / len(frames) if frames else 0
+            # Analyze recording quality. sd.rec already returns float32, the
+            # samples are a view of it and all statistics come from one buffer
+            # of squared samples
+            samples = recording.reshape(-1)
+            sq = np.empty_like(samples)
+            np.multiply(samples, samples, out=sq)
+            max_amplitude = float(np.sqrt(sq.max()))
+            rms = float(np.sqrt(sq.mean()))
+
+            # Detect if there is voice activity: a 100ms frame is active when its
+            # RMS exceeds 0.01, compared as mean energy so no per-frame sqrt
+            frame_length = int(0.1 * sample_rate)
+            n = sq.size // frame_length
+            if n:
+                frame_energy = sq[: n * frame_length].reshape(n, frame_length).mean(
+                    axis=1
+                )
+                active_frames = int(np.count_nonzero(frame_energy > 0.01**2))
+                activity_ratio = active_frames / n
+            else:
+                activity_ratio = 0.0
 
             # Test result analysis
             if max_amplitude < 0.001:
@@ -412,69 +590,94 @@ class AudioWidget(QWidget):
             return
 
         try:
-            device_id = self.ui_controls["output_device_combo"].currentData()
+            device_id = self.output_device_combo.currentData()
             if device_id is None:
                 QMessageBox.warning(self, "hint", "Please select the output device first")
                 return
 
             self.testing_output = True
-            self.ui_controls["test_output_btn"].setEnabled(False)
-            self.ui_controls["test_output_btn"].setText("Playing...")
+            self.test_output_btn.setEnabled(False)
+            self.test_output_btn.setText("Playing...")
 
-            # Execute tests in a thread
-            test_thread = threading.Thread(
-                target=self._do_output_test, args=(device_id,)
+            # Get device information and sampling rate
+            output_device = self._output_by_id.get(device_id)
+            if not output_device:
+                self._append_status("Error: Unable to get device information")
+                self._reset_output_test_ui()
+                return
+
+            sample_rate = int(output_device["sample_rate"])
+            self._append_status(
+                f"Start playback test (device: {device_id}, sampling rate: {sample_rate}Hz)"
+            )
+            self._append_status("Please have your headphones/speakers ready, the test sound will be played soon...")
+
+            # Count down on the GUI thread, the playback itself runs in the pool
+            self._start_countdown(
+                "Start playing in {} seconds...",
+                lambda: QThreadPool.globalInstance().start(
+                    _TestWorker(self._do_output_test, device_id, sample_rate)
+                ),
+                self._reset_output_test_ui,
             )
-            test_thread.daemon = True
-            test_thread.start()
 
         except Exception as e:
             self.logger.error(f"Test output device failed: {e}", exc_info=True)
             self._append_status(f"Output device test failed: {str(e)}")
             self._reset_output_test_ui()
 
-    def _do_output_test(self, device_id):
+    def _do_output_test(self, device_id, sample_rate):
         """Perform output device testing."""
         try:
-            # Get device information and sampling rate
-            output_device = next(
-                (d for d in self.output_devices if d["id"] == device_id), None
-            )
-            if not output_device:
-                self._append_status_threadsafe("Error: Unable to get device information")
-                return
-
-            sample_rate = int(output_device["sample_rate"])
             duration = 2.0  # Play time
             frequency = 440  # 440Hz A sound
 
-            self._append_status_threadsafe(
-                f"Start playback test (device: {device_id}, sampling rate: {sample_rate}Hz)"
-            )
-            self._append_status_threadsafe("Please have your headphones/speakers ready, the test sound will be played soon...")
-
-            # Countdown reminder
-            for i in range(3, 0, -1):
-                self._append_status_threadsafe(f"Start playing in {i} seconds...")
-                time.sleep(1)
-
             self._append_status_threadsafe(
                 f"Playing {frequency}Hz test tone ({duration} seconds)..."
             )
 
-            # Generate test audio (sine wave)
-            t = np.linspace(0, duration, int(sample_rate * duration))
+            # Synthesize the sine wave block by block in the stream callback
+            total_samples = int(sample_rate * duration)
             # Add fade effects to avoid popping sounds
             fade_samples = int(0.1 * sample_rate)  # 0.1 second fade in and fade out
-            audio = 0.3 * np.sin(2 * np.pi * frequency * t)
-
-            # Apply fade
-            audio[:fade_samples] *= np.linspace(0, 1, fade_samples)
-            audio[-fade_samples:] *= np.linspace(1, 0, fade_samples)
+            fade_out_start = total_samples - fade_samples
+            # The waveform repeats exactly every sample_rate / gcd(sample_rate, frequency)
+            # samples (1200 at 48kHz/440Hz), so sin() is evaluated once per sample of
+            # that cycle and the blocks are read from the table
+            cycle = sample_rate // math.gcd(sample_rate, frequency)
+            table = (
+                0.3 * np.sin(2 * np.pi * frequency * np.arange(cycle) / sample_rate)
+            ).astype(np.float32)
+            position = 0
+            finished = threading.Event()
+
+            def callback(outdata, frames, time_info, status):
+                nonlocal position
+                idx = np.arange(position, position + frames)
+                block = table[idx % cycle]
+
+                # Apply fade only when this block overlaps a fade region
+                if position < fade_samples:
+                    block *= np.minimum(idx / fade_samples, 1.0)
+                if position + frames > fade_out_start:
+                    block *= np.clip((total_samples - idx) / fade_samples, 0.0, 1.0)
+
+                outdata[:, 0] = block
+                position += frames
+                if position >= total_samples:
+                    raise sd.CallbackStop
 
             # Play audio
-            sd.play(audio, samplerate=sample_rate, device=device_id)
-            sd.wait()
+            with sd.OutputStream(
+                samplerate=sample_rate,
+                channels=1,
+                device=device_id,
+                dtype="float32",
+                blocksize=1024,
+                callback=callback,
+                finished_callback=finished.set,
+            ):
+                finished.wait(duration + 1.0)
 
             self._append_status_threadsafe("Playback completed")
             self._append_status_threadsafe(
@@ -491,11 +694,39 @@ class AudioWidget(QWidget):
             # Reset UI state (switch back to main thread)
             self._reset_output_ui_threadsafe()
 
+    def _start_countdown(self, message, on_finished, on_cancelled, seconds=3):
+        """Show a once-per-second countdown in the status area, then call on_finished.
+
+        The timer is a child of the component, so it stops with it; closing the
+        settings window stops it and calls on_cancelled instead."""
+        timer = QTimer(self)
+        timer.setInterval(1000)
+        remaining = [seconds]
+
+        def tick():
+            if remaining[0] == 0:
+                self._stop_countdown(timer)
+                on_finished()
+            else:
+                self._append_status(message.format(remaining[0]))
+                remaining[0] -= 1
+
+        self._countdowns[timer] = on_cancelled
+        timer.timeout.connect(tick)
+        tick()
+        timer.start()
+
+    def _stop_countdown(self, timer):
+        """Stop a countdown timer, returning its cancel callback."""
+        timer.stop()
+        timer.deleteLater()
+        return self._countdowns.pop(timer, None)
+
     def _reset_input_test_ui(self):
         """Reset input test UI state."""
         self.testing_input = False
-        self.ui_controls["test_input_btn"].setEnabled(True)
-        self.ui_controls["test_input_btn"].setText("Test recording")
+        self.test_input_btn.setEnabled(True)
+        self.test_input_btn.setText("Test recording")
 
     def _reset_input_ui_threadsafe(self):
         try:
@@ -506,8 +737,8 @@ class AudioWidget(QWidget):
     def _reset_output_test_ui(self):
         """Reset the output test UI state."""
         self.testing_output = False
-        self.ui_controls["test_output_btn"].setEnabled(True)
-        self.ui_controls["test_output_btn"].setText("Test play")
+        self.test_output_btn.setEnabled(True)
+        self.test_output_btn.setText("Test play")
 
     def _reset_output_ui_threadsafe(self):
         try:
@@ -516,41 +747,46 @@ class AudioWidget(QWidget):
             self.logger.error(f"Thread-safe reset output test UI failed: {e}")
 
     def _append_status(self, message):
-        """Add status information."""
+        """Add status information (main thread), shown right away."""
+        current_time = time.strftime("%H:%M:%S")
+        self._pending_status.append(f"[{current_time}] {message}")
+        self._drain_status()
+
+    def _append_status_threadsafe(self, message):
+        """Queue status information from any thread, the status timer appends it on the main thread."""
+        current_time = time.strftime("%H:%M:%S")
+        self._pending_status.append(f"[{current_time}] {message}")
+        # Only the first line of a batch wakes the main thread
+        if not self._status_scheduled:
+            self._status_scheduled = True
+            self.status_pending.emit()
+
+    def _start_status_timer(self):
+        if not self._status_timer.isActive():
+            self._status_timer.start()
+
+    def _drain_status(self):
+        """Append all queued status lines to the QTextEdit at once."""
         try:
-            if self.ui_controls["status_text"]:
-                current_time = time.strftime("%H:%M:%S")
-                formatted_message = f"[{current_time}] {message}"
-                self.ui_controls["status_text"].append(formatted_message)
+            lines = []
+            for _ in range(len(self._pending_status)):
+                lines.append(self._pending_status.popleft())
+            if lines and self.status_text:
+                self.status_text.append("\n".join(lines))
                 # scroll to bottom
-                self.ui_controls["status_text"].verticalScrollBar().setValue(
-                    self.ui_controls["status_text"].verticalScrollBar().maximum()
+                self.status_text.verticalScrollBar().setValue(
+                    self.status_text.verticalScrollBar().maximum()
                 )
         except Exception as e:
             self.logger.error(f"Failed to add status information: {e}", exc_info=True)
-
-    def _append_status_threadsafe(self, message):
-        """A background thread safely appends the status text to the QTextEdit (switch back to the main thread via a signal)."""
-        try:
-            if not self.ui_controls.get("status_text"):
-                return
-            current_time = time.strftime("%H:%M:%S")
-            formatted_message = f"[{current_time}] {message}"
-            self.status_message.emit(formatted_message)
-        except Exception as e:
-            self.logger.error(f"Thread-safe append state failed: {e}", exc_info=True)
-
-    def _on_status_message(self, formatted_message: str):
-        try:
-            if not self.ui_controls.get("status_text"):
-                return
-            self.ui_controls["status_text"].append(formatted_message)
-            # scroll to bottom
-            self.ui_controls["status_text"].verticalScrollBar().setValue(
-                self.ui_controls["status_text"].verticalScrollBar().maximum()
-            )
-        except Exception as e:
-            self.logger.error(f"Status text append failed: {e}")
+        finally:
+            # Cleared before the check, so a line queued meanwhile either shows
+            # up here or emits status_pending again
+            self._status_scheduled = False
+            if self._pending_status:
+                self._status_scheduled = True
+            else:
+                self._status_timer.stop()
 
     def _load_config_values(self):
         """Load values ​​from configuration files to UI controls."""
@@ -561,24 +797,29 @@ class AudioWidget(QWidget):
             # Set up input devices
             input_device_id = audio_config.get("input_device_id")
             if input_device_id is not None:
-                index = self.ui_controls["input_device_combo"].findData(input_device_id)
+                index = self.input_device_combo.findData(input_device_id)
                 if index >= 0:
-                    self.ui_controls["input_device_combo"].setCurrentIndex(index)
+                    self.input_device_combo.setCurrentIndex(index)
 
             # Set up output device
             output_device_id = audio_config.get("output_device_id")
             if output_device_id is not None:
-                index = self.ui_controls["output_device_combo"].findData(
-                    output_device_id
-                )
+                index = self.output_device_combo.findData(output_device_id)
                 if index >= 0:
-                    self.ui_controls["output_device_combo"].setCurrentIndex(index)
+                    self.output_device_combo.setCurrentIndex(index)
 
             # Device information is automatically updated when device selection changes, no manual settings required
 
         except Exception as e:
             self.logger.error(f"Failed to load audio device configuration values: {e}", exc_info=True)
 
+    def cancel_tests(self):
+        """Cancel pending test countdowns, called when the settings window closes."""
+        for timer in list(self._countdowns):
+            on_cancelled = self._stop_countdown(timer)
+            if on_cancelled:
+                on_cancelled()
+
     def get_config_data(self) -> dict:
         """Get current configuration data."""
         config_data = {}
@@ -587,32 +828,24 @@ class AudioWidget(QWidget):
             audio_config = {}
 
             # Enter device configuration
-            input_device_id = self.ui_controls["input_device_combo"].currentData()
+            input_device_id = self.input_device_combo.currentData()
             if input_device_id is not None:
                 audio_config["input_device_id"] = input_device_id
-                audio_config["input_device_name"] = self.ui_controls[
-                    "input_device_combo"
-                ].currentText()
+                audio_config["input_device_name"] = self.input_device_combo.currentText()
 
             # Output device configuration
-            output_device_id = self.ui_controls["output_device_combo"].currentData()
+            output_device_id = self.output_device_combo.currentData()
             if output_device_id is not None:
                 audio_config["output_device_id"] = output_device_id
-                audio_config["output_device_name"] = self.ui_controls[
-                    "output_device_combo"
-                ].currentText()
+                audio_config["output_device_name"] = self.output_device_combo.currentText()
 
             # The sampling rate information of the device is automatically determined by the device and does not require user configuration.
             # Save the device's default sample rate for subsequent use
-            input_device = next(
-                (d for d in self.input_devices if d["id"] == input_device_id), None
-            )
+            input_device = self._input_by_id.get(input_device_id)
             if input_device:
                 audio_config["input_sample_rate"] = int(input_device["sample_rate"])
 
-            output_device = next(
-                (d for d in self.output_devices if d["id"] == output_device_id), None
-            )
+            output_device = self._output_by_id.get(output_device_id)
             if output_device:
                 audio_config["output_sample_rate"] = int(output_device["sample_rate"])
 
@@ -633,8 +866,8 @@ class AudioWidget(QWidget):
             # The sampling rate information will be automatically displayed after the device is scanned, no manual setting is required.
 
             # Clear status display
-            if self.ui_controls["status_text"]:
-                self.ui_controls["status_text"].clear()
+            if self.status_text:
+                self.status_text.clear()
 
             self._append_status("Reset to default settings")
             self.logger.info("Audio device configuration has been reset to defaults")
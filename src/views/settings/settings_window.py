@@ -88,6 +88,8 @@ class SettingsWindow(QDialog):
             self.audio_tab = AudioWidget()
             tab_widget.addTab(self.audio_tab, "audio equipment")
             self.audio_tab.settings_changed.connect(self._on_settings_changed)
+            # Tabs get no closeEvent, stop pending device tests with the dialog
+            self.finished.connect(self.audio_tab.cancel_tests)
 
             # Create and add shortcut key setting components
             self.shortcuts_tab = ShortcutsSettingsWidget()